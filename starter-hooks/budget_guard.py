@@ -0,0 +1,111 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Refuse or warn on prompts once daily or weekly spend crosses a budget.
+
+Runs on every UserPromptSubmit, so it never scans daily metrics: it reads
+the running totals that cost_tracker.py maintains on each Stop (at most
+seven small entries, replaced atomically) and sums them.
+
+Configure with environment variables (e.g. in settings.json "env"):
+- CLAUDE_BUDGET_DAILY_USD   - today's spend limit
+- CLAUDE_BUDGET_WEEKLY_USD  - limit over the last 7 days, including today
+- CLAUDE_BUDGET_MODE        - "block" (default) or "warn"
+- CLAUDE_BUDGET_WARN_AT     - fraction of a budget that triggers a warning (default 0.8)
+
+Register it WITHOUT `|| true`, otherwise exit code 2 cannot block.
+"""
+
+# Deliberately lean imports - this runs before every prompt
+import json
+import os
+import sys
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from utils.constants import METRICS_DIR
+
+# Same file as cost_tracker.SPEND_TOTALS
+SPEND_TOTALS = METRICS_DIR / 'spend_totals.json'
+WEEK_DAYS = 7
+
+
+def read_budget(name: str) -> Optional[float]:
+    """A budget in USD from the environment, or None when unset/invalid."""
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        budget = float(value)
+    except ValueError:
+        return None
+    return budget if budget > 0 else None
+
+
+def load_spend() -> Tuple[float, float]:
+    """Today's and the last week's spend from the running totals (O(1))."""
+    try:
+        with open(SPEND_TOTALS) as f:
+            days = json.load(f).get('days', {})
+    except (OSError, ValueError):
+        return 0.0, 0.0
+
+    today = date.today()
+    week_start = (today - timedelta(days=WEEK_DAYS - 1)).isoformat()
+    daily = days.get(today.isoformat(), 0.0)
+    weekly = sum(spent for day, spent in days.items() if day >= week_start)
+    return daily, weekly
+
+
+def check_budgets(daily: float, weekly: float, daily_budget: Optional[float],
+                  weekly_budget: Optional[float], warn_at: float) -> Tuple[List[str], List[str]]:
+    """Return (exceeded, approaching) messages for each configured budget."""
+    exceeded, approaching = [], []
+    for label, spent, budget in (('Daily', daily, daily_budget), ('Weekly', weekly, weekly_budget)):
+        if budget is None:
+            continue
+        if spent >= budget:
+            exceeded.append(f"{label} spend ${spent:.2f} has reached the ${budget:.2f} budget")
+        elif spent >= budget * warn_at:
+            approaching.append(f"{label} spend ${spent:.2f} is at {spent / budget:.0%} of the ${budget:.2f} budget")
+    return exceeded, approaching
+
+
+def main():
+    try:
+        daily_budget = read_budget('CLAUDE_BUDGET_DAILY_USD')
+        weekly_budget = read_budget('CLAUDE_BUDGET_WEEKLY_USD')
+        if daily_budget is None and weekly_budget is None:
+            sys.exit(0)  # no budgets configured - nothing to read
+
+        try:
+            warn_at = float(os.environ.get('CLAUDE_BUDGET_WARN_AT', '0.8'))
+        except ValueError:
+            warn_at = 0.8
+        block = os.environ.get('CLAUDE_BUDGET_MODE', 'block').lower() != 'warn'
+
+        daily, weekly = load_spend()
+        exceeded, approaching = check_budgets(daily, weekly, daily_budget, weekly_budget, warn_at)
+
+        if exceeded and block:
+            print("BLOCKED: " + "; ".join(exceeded) + ".", file=sys.stderr)
+            print("Raise CLAUDE_BUDGET_DAILY_USD / CLAUDE_BUDGET_WEEKLY_USD or set CLAUDE_BUDGET_MODE=warn to continue.",
+                  file=sys.stderr)
+            sys.exit(2)  # Exit code 2 blocks the prompt and shows the reason to the user
+
+        warnings = exceeded + approaching
+        if warnings:
+            # systemMessage is shown to the user without adding to the prompt
+            print(json.dumps({'systemMessage': "Budget: " + "; ".join(warnings) + "."}))
+
+        sys.exit(0)
+
+    except Exception:
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
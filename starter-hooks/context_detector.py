@@ -13,67 +13,182 @@ which stack to target.
 
 Reads YAML context configs from .claude/contexts/*.yaml.
 Skips silently when no configs exist (e.g. frontend-only projects).
+
+The detected context's `skills:` are listed with their descriptions from
+the skill catalog (utils/skill_catalog.py). Set CLAUDE_SKILLS_SUGGEST=N to
+also suggest the N installed skills that best match the prompt.
 """
 
 import json
+import os
 import sys
 import re
 from pathlib import Path
 
-try:
-    import yaml
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
+from utils.content_cache import ContentCache
+from utils.deadline import DeadlineExceeded, DeadlineGuard
+from utils.metrics import hook_timer
+from utils.prompt_analysis import PromptView, analyze_prompt
+from utils.skill_catalog import SkillCatalog
 
 CONTEXTS_DIR = Path('.claude/contexts')
 MIN_CONFIDENCE = 15  # minimum score to inject context
 
+# Score per matched indicator
+PATH_SCORE = 10
+EXTENSION_SCORE = 5
+KEYWORD_SCORE = 3
+
+# Parsed configs + matchers, shared across checkouts by content hash
+CONTEXTS_CACHE = ContentCache('contexts', version=1)
+
+# Extra skills matched against the prompt (0 = only the context's own skills)
+try:
+    SKILLS_SUGGEST = int(os.environ.get('CLAUDE_SKILLS_SUGGEST', '0'))
+except ValueError:
+    SKILLS_SUGGEST = 0
+SKILL_DESCRIPTION_CHARS = 120
+
+
+def import_yaml():
+    """Import pyyaml on first use - most prompts in single-context projects never need it."""
+    try:
+        import yaml
+        return yaml
+    except ImportError:
+        return None
+
+
+def load_contexts() -> tuple[dict[str, dict], dict[str, dict]]:
+    """
+    Load all YAML context configs and their indicator matchers.
 
-def load_configs() -> dict[str, dict]:
-    """Load all YAML context configs."""
-    if not HAS_YAML or not CONTEXTS_DIR.exists():
-        return {}
+    Parsed results are cached per user by content hash, so identical
+    configs in other worktrees (or on the next prompt) skip pyyaml entirely.
+    """
+    if not CONTEXTS_DIR.exists():
+        return {}, {}
+
+    config_files = sorted(CONTEXTS_DIR.glob('*.yaml'))
+    if not config_files:
+        return {}, {}
+
+    contents = [(f.stem, f.read_bytes()) for f in config_files]
+    key = CONTEXTS_CACHE.key(*(part for stem, data in contents for part in (stem, data)))
+    cached = CONTEXTS_CACHE.get(key)
+    if cached is not None:
+        return cached['configs'], cached['matchers']
+
+    yaml = import_yaml()
+    if yaml is None:
+        return {}, {}
 
     configs = {}
-    for f in CONTEXTS_DIR.glob('*.yaml'):
+    for stem, data in contents:
         try:
-            configs[f.stem] = yaml.safe_load(f.read_text()) or {}
+            configs[stem] = yaml.safe_load(data.decode('utf-8')) or {}
         except Exception:
             continue
-    return configs
 
+    matchers = {name: build_matcher(config) for name, config in configs.items()}
+    CONTEXTS_CACHE.put(key, {'configs': configs, 'matchers': matchers})
+    return configs, matchers
 
-def score_context(text: str, config: dict) -> int:
-    """Score how well the prompt matches a context's indicators."""
+
+def build_matcher(config: dict) -> dict:
+    """Precompute the normalized indicators a prompt is scored against."""
     indicators = config.get('indicators', {})
-    score = 0
-    text_lower = text.lower()
+    return {
+        'paths': [path.lower() for path in indicators.get('paths', [])],
+        'extensions': [rf'\w+{re.escape(ext)}|{re.escape(ext)}\b' for ext in indicators.get('extensions', [])],
+        'keywords': [keyword.lower() for keyword in indicators.get('keywords', [])],
+    }
 
-    for path in indicators.get('paths', []):
-        if path.lower() in text_lower:
-            score += 10
 
-    for ext in indicators.get('extensions', []):
-        if re.search(rf'\w+{re.escape(ext)}|{re.escape(ext)}\b', text, re.IGNORECASE):
-            score += 5
+def max_score(matcher: dict) -> int:
+    """The score if every indicator matched."""
+    return (PATH_SCORE * len(matcher['paths'])
+            + EXTENSION_SCORE * len(matcher['extensions'])
+            + KEYWORD_SCORE * len(matcher['keywords']))
 
-    for keyword in indicators.get('keywords', []):
-        if keyword.lower() in text_lower:
-            score += 3
+
+def score_context(view: PromptView, matcher: dict, stop_below: int = 0) -> int:
+    """
+    Score how well the prompt matches a context's indicators.
+
+    Stops as soon as the score can no longer reach `stop_below`, returning
+    the partial (losing) score.
+    """
+    score = 0
+    remaining = max_score(matcher)
+
+    for path in matcher['paths']:
+        remaining -= PATH_SCORE
+        if path in view.lower:
+            score += PATH_SCORE
+        elif score + remaining < stop_below:
+            return score
+
+    for pattern in matcher['extensions']:
+        remaining -= EXTENSION_SCORE
+        if re.search(pattern, view.lower, re.IGNORECASE):
+            score += EXTENSION_SCORE
+        elif score + remaining < stop_below:
+            return score
+
+    for keyword in matcher['keywords']:
+        remaining -= KEYWORD_SCORE
+        if keyword in view.lower:
+            score += KEYWORD_SCORE
+        elif score + remaining < stop_below:
+            return score
 
     return score
 
 
-def check_manual_override(prompt: str, config_names: list[str]) -> str | None:
+def check_manual_override(view: PromptView, config_names: list[str]) -> str | None:
     """Check for [frontend] or [backend] manual override in prompt."""
     for name in config_names:
-        if f'[{name}]' in prompt.lower():
+        if f'[{name}]' in view.lower:
             return name
     return None
 
 
-def format_context_output(name: str, config: dict, confidence: int) -> str:
+def find_skills(config: dict, prompt: str) -> tuple[list[dict], list[dict]]:
+    """The context's declared skills and the top prompt matches, from the catalog."""
+    declared = config.get('skills') or []
+    if isinstance(declared, str):
+        declared = [declared]
+    if not declared and SKILLS_SUGGEST <= 0:
+        return [], []
+
+    catalog = SkillCatalog()
+    try:
+        catalog.refresh()
+        skills = catalog.lookup(declared)
+        suggested = catalog.match(prompt, SKILLS_SUGGEST, exclude=[s['path'] for s in skills])
+    except Exception:
+        # Index unavailable (e.g. read-only logs dir) - still name the declared skills
+        return [{'path': None, 'name': str(ref), 'description': ''} for ref in declared], []
+    finally:
+        catalog.close()
+    return skills, suggested
+
+
+def format_skill(skill: dict) -> str:
+    description = skill['description']
+    if len(description) > SKILL_DESCRIPTION_CHARS:
+        description = description[:SKILL_DESCRIPTION_CHARS - 3].rstrip() + '...'
+    line = f"  - {skill['name']}"
+    if description:
+        line += f": {description}"
+    if skill['path']:
+        line += f" (.claude/skills/{skill['path']}/SKILL.md)"
+    return line
+
+
+def format_context_output(name: str, config: dict, confidence: int,
+                          skills: list[dict] = (), suggested: list[dict] = ()) -> str:
     """Format detected context for injection into the prompt."""
     parts = []
     parts.append("")
@@ -105,11 +220,57 @@ def format_context_output(name: str, config: dict, confidence: int) -> str:
         for role, agent in agents.items():
             parts.append(f"  - {role}: {agent}")
 
+    if skills:
+        parts.append("Skills:")
+        parts.extend(format_skill(skill) for skill in skills)
+
+    if suggested:
+        parts.append("Skills matching this prompt:")
+        parts.extend(format_skill(skill) for skill in suggested)
+
     parts.append("-" * 50)
     parts.append("")
     return "\n".join(parts)
 
 
+def detect_context(prompt: str) -> str | None:
+    """Load configs, score the prompt, and return the routing block (or None)."""
+    configs, matchers = load_contexts()
+    if not configs:
+        return None
+
+    config_names = list(configs.keys())
+    view = analyze_prompt(prompt)
+
+    # Check manual override first
+    override = check_manual_override(view, config_names)
+    if override and override in configs:
+        return format_context_output(override, configs[override], 100,
+                                     *find_skills(configs[override], view.text))
+
+    # Score the contexts with the highest possible score first. A context is
+    # only scanned while it could still reach MIN_CONFIDENCE and overtake the
+    # leader (ties go to the first config, as before).
+    bounds = {name: max_score(matchers[name]) for name in config_names}
+    detected, best = None, 0
+    for name in sorted(config_names, key=bounds.get, reverse=True):
+        if bounds[name] < max(MIN_CONFIDENCE, best):
+            break  # sorted by bound - no later context can win either
+        needed = best if detected and config_names.index(name) < config_names.index(detected) else best + 1
+        needed = max(MIN_CONFIDENCE, needed)
+        score = score_context(view, matchers[name], stop_below=needed)
+        if score >= needed:
+            detected, best = name, score
+
+    if detected is None:
+        return None
+
+    confidence = min(100, best * 5)
+
+    return format_context_output(detected, configs[detected], confidence,
+                                 *find_skills(configs[detected], view.text))
+
+
 def main():
     try:
         input_data = json.load(sys.stdin)
@@ -118,33 +279,15 @@ def main():
         if not prompt or len(prompt.strip()) < 3:
             sys.exit(0)
 
-        configs = load_configs()
-        if not configs:
-            sys.exit(0)
-
-        config_names = list(configs.keys())
+        # Slow disks or huge config dirs fall back to this session's last routing
+        guard = DeadlineGuard('context_detector', input_data.get('session_id', 'unknown'))
+        try:
+            output = guard.run(lambda: detect_context(prompt))
+        except DeadlineExceeded as exc:
+            output = exc.fallback
 
-        # Check manual override first
-        override = check_manual_override(prompt, config_names)
-        if override and override in configs:
-            output = format_context_output(override, configs[override], 100)
+        if output:
             print(output)
-            sys.exit(0)
-
-        # Score each context
-        scores = {}
-        for name, config in configs.items():
-            scores[name] = score_context(prompt, config)
-
-        max_score = max(scores.values()) if scores else 0
-        if max_score < MIN_CONFIDENCE:
-            sys.exit(0)
-
-        detected = max(scores, key=scores.get)
-        confidence = min(100, max_score * 5)
-
-        output = format_context_output(detected, configs[detected], confidence)
-        print(output)
 
         sys.exit(0)
 
@@ -153,4 +296,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    with hook_timer('context_detector'):
+        main()
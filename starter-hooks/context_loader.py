@@ -11,16 +11,77 @@ L1 Memory Files (always loaded for significant prompts):
 - decisions.md - Architectural decisions
 - lessons.md - Lessons learned
 - conventions.md - Code conventions
+
+Injection is session-aware: the hash of every block sent is recorded per
+session, and later prompts only re-send blocks that changed. Unchanged
+blocks are replaced by a one-line marker until the next full re-send
+(every CLAUDE_CONTEXT_RESEND_TURNS turns, or after compaction).
+
+Only prompts that look like work trigger injection: whole words such as
+"add" or "fixing" (not "address" or "prefix") or slash commands such as
+/flow:plan, configurable in .claude/context/triggers.json. Every decision
+is appended to logs/context_loader_decisions.jsonl - summarize it with
+tools/trigger_report.py.
 """
 
+import hashlib
 import json
+import os
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
 
+from utils.constants import LOG_BASE_DIR, ensure_session_log_dir, get_session_log_dir
+from utils.content_cache import ContentCache
+from utils.deadline import DeadlineExceeded, DeadlineGuard
+from utils.fileio import append_jsonl
+from utils.metrics import hook_timer
+from utils.prompt_analysis import PromptView, analyze_prompt, path_tokens
+
 CONTEXT_FILE = Path('.claude/context/session_context.json')
 MEMORY_DIR = Path('.claude/memory')
 
+# Per-session record of what has already been injected
+INJECTION_STATE_FILE = 'context_loader_state.json'
+
+# Re-send every block in full after this many injecting turns
+try:
+    FULL_RESEND_TURNS = int(os.environ.get('CLAUDE_CONTEXT_RESEND_TURNS', '10'))
+except ValueError:
+    FULL_RESEND_TURNS = 10
+
+# Rendered blocks, shared across checkouts by content hash
+MEMORY_CACHE = ContentCache('memory', version=1)
+
+# Overrides for the trigger words and slash commands below
+TRIGGERS_FILE = Path('.claude/context/triggers.json')
+
+# Words (any inflection: add/adds/added/adding) that mark a prompt as work
+DEFAULT_TRIGGER_KEYWORDS = [
+    'plan', 'implement', 'create', 'add', 'build', 'feature',
+    'fix', 'refactor', 'update', 'change', 'modify',
+]
+
+# Slash commands that always inject; `flow` also covers /flow:plan etc.
+DEFAULT_TRIGGER_COMMANDS = ['ship', 'plan', 'implement', 'flow', 'pipe']
+
+# The substring gate these replaced, kept only to log how often it would have fired
+LEGACY_KEYWORDS = DEFAULT_TRIGGER_KEYWORDS + ['/ship', '/plan', '/implement', '/flow', '/pipe']
+
+# Gate decisions for measuring false positives and tokens saved
+DECISIONS_LOG = Path(LOG_BASE_DIR) / 'context_loader_decisions.jsonl'
+
+# Remembered gate decisions per session (most recent prompts)
+TRIGGER_MEMO_SIZE = 64
+
+# Rough size of a token, for the decisions log
+CHARS_PER_TOKEN = 4
+
+# Whole words and identifiers - `update_user` is one token, not "update" + "user"
+WORD_RE = re.compile(r'\w+')
+COMMAND_RE = re.compile(r'(?<!\S)/([a-z][\w:-]*)(?=\s|$)')
+
 # L1 files to always load
 L1_FILES = [
     'decisions.md',
@@ -142,40 +203,252 @@ def format_context_summary(context: dict) -> str:
     return header + "\n".join(output_parts) + "\n" + "-" * 50 + "\n"
 
 
+def block_hash(text: str) -> str:
+    """Short content hash used to detect changed blocks."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def load_injection_state(session_id: str) -> dict:
+    """Load what was injected earlier in this session."""
+    state_path = get_session_log_dir(session_id) / INJECTION_STATE_FILE
+    if state_path.exists():
+        try:
+            return json.loads(state_path.read_text())
+        except (json.JSONDecodeError, ValueError):
+            return {}
+    return {}
+
+
+def save_injection_state(session_id: str, state: dict):
+    """Persist the injection record for this session."""
+    state_path = ensure_session_log_dir(session_id) / INJECTION_STATE_FILE
+    state_path.write_text(json.dumps(state, indent=2))
+
+
+def reset_injection_state(session_id: str):
+    """Forget injected blocks, forcing a full re-send on the next prompt."""
+    state_path = get_session_log_dir(session_id) / INJECTION_STATE_FILE
+    if state_path.exists():
+        state_path.unlink()
+
+
+def select_blocks(blocks: dict[str, str], state: dict) -> list[str]:
+    """
+    Decide which blocks to emit this turn and update state in place.
+
+    A block is emitted in full when it is new or changed, or when a full
+    re-send is due. Otherwise a short marker pointing at the turn it was
+    last sent replaces it.
+    """
+    turn = state.get('turn', 0) + 1
+    full_resend = turn - state.get('last_full_turn', 0) >= FULL_RESEND_TURNS
+    sent = state.get('blocks', {})
+
+    output_parts = []
+    for label, text in blocks.items():
+        digest = block_hash(text)
+        previous = sent.get(label)
+        if full_resend or not previous or previous.get('hash') != digest:
+            output_parts.append(text)
+            sent[label] = {'hash': digest, 'turn': turn}
+        else:
+            output_parts.append(f"[{label} unchanged since turn {previous['turn']} - already in context]")
+
+    # Drop blocks that no longer exist so they are re-sent if they return
+    for label in list(sent):
+        if label not in blocks:
+            del sent[label]
+
+    state['turn'] = turn
+    state['blocks'] = sent
+    if full_resend or 'last_full_turn' not in state:
+        state['last_full_turn'] = turn
+    return output_parts
+
+
+def inflections(word: str) -> set[str]:
+    """`add` -> add, adds, added, adding; `create` -> creates, created, creating; ..."""
+    forms = {word, word + 's', word + 'es', word + 'ed', word + 'ing'}
+    if word.endswith('e'):
+        forms |= {word + 'd', word[:-1] + 'ing'}
+    if word.endswith('y'):
+        forms |= {word[:-1] + 'ies', word[:-1] + 'ied'}
+    if len(word) >= 3 and word[-1] not in 'aeiouwxy' and word[-2] in 'aeiou' and word[-3] not in 'aeiou':
+        forms |= {word + word[-1] + 'ed', word + word[-1] + 'ing'}  # plan -> planned, planning
+    return forms
+
+
+def load_triggers() -> dict:
+    """
+    Compile the trigger words and commands into lookup sets.
+
+    TRIGGERS_FILE may override either list:
+        {"keywords": ["fix", "deploy"], "commands": ["flow", "ship"]}
+    """
+    config = {}
+    if TRIGGERS_FILE.exists():
+        try:
+            config = json.loads(TRIGGERS_FILE.read_text())
+        except (OSError, ValueError):
+            config = {}
+
+    keywords = [k.lower() for k in config.get('keywords', DEFAULT_TRIGGER_KEYWORDS)]
+    commands = [c.lower().lstrip('/') for c in config.get('commands', DEFAULT_TRIGGER_COMMANDS)]
+
+    words = {}
+    for keyword in keywords:
+        for form in inflections(keyword):
+            words.setdefault(form, keyword)
+
+    digest = block_hash(json.dumps([sorted(keywords), sorted(commands)]))
+    return {'words': words, 'commands': set(commands), 'digest': digest}
+
+
+def classify_prompt(view: PromptView, triggers: dict) -> list[str]:
+    """Return the triggers in the prompt - empty means don't inject."""
+    matched = []
+    for command in COMMAND_RE.findall(view.lower):
+        # /flow:plan matches "flow:plan", "flow" or "plan"
+        for name in (command, *command.split(':')):
+            if name in triggers['commands']:
+                matched.append('/' + command)
+                break
+
+    # Words inside paths (`src/plan/x`, `update_user.py`) aren't requests
+    prose = ' '.join(token for token in view.lower.split() if not path_tokens(token))
+    words = triggers['words']
+    for word in set(WORD_RE.findall(prose)):
+        if word in words:
+            matched.append(words[word])
+    return sorted(set(matched))
+
+
+def classify_cached(view: PromptView, triggers: dict, state: dict) -> tuple[list[str], bool]:
+    """
+    classify_prompt() with a per-session memo keyed by the prompt's hash,
+    so retried or repeated prompts skip the work. Returns (matched, hit).
+    """
+    memo = state.get('triggers', {})
+    if memo.get('digest') != triggers['digest']:
+        memo = {'digest': triggers['digest'], 'prompts': {}}  # trigger config changed
+    prompts = memo['prompts']
+
+    key = block_hash(view.text)
+    if key in prompts:
+        matched, hit = prompts.pop(key), True
+    else:
+        matched, hit = classify_prompt(view, triggers), False
+    prompts[key] = matched  # most recent last
+    while len(prompts) > TRIGGER_MEMO_SIZE:
+        del prompts[next(iter(prompts))]
+
+    state['triggers'] = memo
+    return matched, hit
+
+
+def log_decision(session_id: str, view: PromptView, matched: list[str], memo_hit: bool,
+                 injected_chars: int = 0, skipped_chars: int = 0):
+    """Append one gate decision to the decisions log."""
+    entry = {
+        'timestamp': datetime.now().isoformat(),
+        'session_id': session_id,
+        'prompt_hash': block_hash(view.text),
+        'prompt_chars': view.length,
+        'inject': bool(matched),
+        'matched': matched,
+        'legacy_matched': [kw for kw in LEGACY_KEYWORDS if kw in view],
+        'memo_hit': memo_hit,
+        'injected_tokens': injected_chars // CHARS_PER_TOKEN,
+        'skipped_tokens': skipped_chars // CHARS_PER_TOKEN,
+    }
+    append_jsonl(DECISIONS_LOG, entry)
+
+
+def build_blocks() -> dict[str, str]:
+    """
+    Load and format every injectable block, keyed by label.
+
+    Rendered blocks are cached per user by the content of their source
+    files, so other worktrees with identical memory reuse the render.
+    """
+    parts = []
+    for path in [CONTEXT_FILE] + [MEMORY_DIR / filename for filename in L1_FILES]:
+        parts.append(path.name)
+        parts.append(path.read_bytes() if path.exists() else b'\0missing')
+    key = MEMORY_CACHE.key(*parts)
+    return MEMORY_CACHE.get_or_compute(key, render_blocks)
+
+
+def render_blocks() -> dict[str, str]:
+    """Format session context and L1 memory blocks from the files on disk."""
+    blocks = {}
+
+    # Load and format session context
+    context = load_context()
+    if context:
+        context_output = format_context_summary(context)
+        if context_output:
+            blocks['SESSION CONTEXT'] = context_output
+
+    # Load and format L1 memory (summary only)
+    l1_content = load_l1_memory()
+    if l1_content:
+        l1_output = format_l1_summary(l1_content)
+        if l1_output:
+            blocks['L1 MEMORY'] = l1_output
+
+    return blocks
+
+
 def main():
     """Hook entry point - inject context on UserPromptSubmit."""
     try:
         input_data = json.load(sys.stdin)
-        prompt = input_data.get('prompt', '').lower()
-
-        # Keywords that trigger context loading
-        relevant_keywords = [
-            'plan', 'implement', 'create', 'add', 'build', 'feature',
-            'fix', 'refactor', 'update', 'change', 'modify',
-            '/ship', '/plan', '/implement', '/flow', '/pipe'
-        ]
+        session_id = input_data.get('session_id')
 
-        if not any(kw in prompt for kw in relevant_keywords):
+        # Compaction drops earlier injections from the model's context
+        if input_data.get('hook_event_name') == 'PreCompact':
+            if session_id:
+                reset_injection_state(session_id)
             sys.exit(0)
 
-        output_parts = []
+        # Bounded, lowercased view - pasted logs don't make the gate scan megabytes
+        prompt = analyze_prompt(input_data.get('prompt', ''))
 
-        # Load and format session context
-        context = load_context()
-        if context:
-            context_output = format_context_summary(context)
-            if context_output:
-                output_parts.append(context_output)
+        state = load_injection_state(session_id) if session_id else {}
+        matched, memo_hit = classify_cached(prompt, load_triggers(), state)
+
+        if not matched:
+            if session_id and not memo_hit:  # a hit changes nothing worth a write
+                save_injection_state(session_id, state)
+            # What a keyword hit would have cost: the last full render
+            skipped = DeadlineGuard('context_loader', 'memory').fallback() or ''
+            log_decision(session_id, prompt, matched, memo_hit, skipped_chars=len(skipped))
+            sys.exit(0)
+
+        # A slow disk falls back to the last full render; the dedupe record is
+        # reset because what was sent may be stale
+        guard = DeadlineGuard('context_loader', 'memory')
+        try:
+            blocks = guard.run(build_blocks, cache=lambda b: "\n".join(b.values()) or None)
+        except DeadlineExceeded as exc:
+            if session_id:
+                reset_injection_state(session_id)
+            log_decision(session_id, prompt, matched, memo_hit, injected_chars=len(exc.fallback or ''))
+            if exc.fallback:
+                print(exc.fallback)
+            sys.exit(0)
 
-        # Load and format L1 memory (summary only)
-        l1_content = load_l1_memory()
-        if l1_content:
-            l1_output = format_l1_summary(l1_content)
-            if l1_output:
-                output_parts.append(l1_output)
+        if session_id:
+            output_parts = select_blocks(blocks, state)
+            save_injection_state(session_id, state)
+        else:
+            output_parts = list(blocks.values())
 
-        if output_parts:
-            print("\n".join(output_parts))
+        output = "\n".join(output_parts)
+        log_decision(session_id, prompt, matched, memo_hit, injected_chars=len(output))
+        if output:
+            print(output)
 
         sys.exit(0)
 
@@ -184,4 +457,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    with hook_timer('context_loader'):
+        main()
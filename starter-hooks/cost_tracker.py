@@ -6,17 +6,31 @@
 """
 Track token usage and estimated costs per session/command.
 Logs to .claude/metrics/ for analysis.
+
+Token usage is read incrementally from the session transcript: only the
+lines appended since the previous Stop of the same session are parsed.
 """
 
 import json
 import sys
+import time
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional
 
-METRICS_DIR = Path('.claude/metrics')
+from utils.constants import METRICS_DIR
+from utils.deadline import DeadlineExceeded, DeadlineGuard
+from utils.fileio import write_atomic
+from utils.locking import file_lock
+from utils.metrics import MetricsExporter, hook_timer
+
 DAILY_LOG = METRICS_DIR / 'daily'
 SUMMARY_FILE = METRICS_DIR / 'usage_summary.json'
+TRANSCRIPT_OFFSETS = METRICS_DIR / 'transcript_offsets.json'
+
+# Running spend per day for budget_guard.py (last SPEND_WINDOW_DAYS days only)
+SPEND_TOTALS = METRICS_DIR / 'spend_totals.json'
+SPEND_WINDOW_DAYS = 7
 
 # Approximate costs per 1M tokens (adjust as needed)
 PRICING = {
@@ -28,6 +42,140 @@ PRICING = {
     'claude-opus-4-5': {'input': 15.0, 'output': 75.0},
 }
 
+# Prompt caching, as multiples of the input price
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+# Forget transcript offsets of sessions idle for longer than this
+OFFSET_TTL_SECONDS = 7 * 24 * 3600
+
+
+def get_pricing(model: str) -> Optional[Dict[str, float]]:
+    """Find pricing by longest matching prefix (model ids carry a date suffix)."""
+    matches = [key for key in PRICING if model.startswith(key)]
+    if not matches:
+        return None
+    return PRICING[max(matches, key=len)]
+
+
+def estimate_cost(model: str, tokens: Dict[str, int]) -> float:
+    """Estimate the USD cost of a token breakdown for one model."""
+    pricing = get_pricing(model)
+    if not pricing:
+        return 0.0
+    input_price = pricing['input']
+    cost = (
+        tokens.get('input', 0) * input_price
+        + tokens.get('output', 0) * pricing['output']
+        + tokens.get('cache_write', 0) * input_price * CACHE_WRITE_MULTIPLIER
+        + tokens.get('cache_read', 0) * input_price * CACHE_READ_MULTIPLIER
+    )
+    return cost / 1_000_000
+
+
+def parse_usage(lines: list, seen_ids: set) -> Dict[str, Dict[str, int]]:
+    """Sum token usage per model from transcript lines, once per message id."""
+    usage: Dict[str, Dict[str, int]] = {}
+    for line in lines:
+        if b'"usage"' not in line:
+            continue  # cheap pre-filter, most lines carry no usage
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, ValueError):
+            continue
+        message = entry.get('message')
+        if not isinstance(message, dict) or not isinstance(message.get('usage'), dict):
+            continue
+
+        # Streaming writes one line per content block, each repeating the usage
+        message_id = message.get('id')
+        if message_id:
+            if message_id in seen_ids:
+                continue
+            seen_ids.add(message_id)
+
+        raw = message['usage']
+        model = usage.setdefault(message.get('model', 'unknown'), {})
+        for token_type, key in (
+            ('input', 'input_tokens'),
+            ('output', 'output_tokens'),
+            ('cache_write', 'cache_creation_input_tokens'),
+            ('cache_read', 'cache_read_input_tokens'),
+        ):
+            model[token_type] = model.get(token_type, 0) + int(raw.get(key) or 0)
+    return usage
+
+
+def read_new_usage(session_id: str, transcript_path: Optional[str]) -> Dict[str, Dict[str, int]]:
+    """Parse only the transcript bytes appended since this session's last Stop."""
+    if not transcript_path or not Path(transcript_path).exists():
+        return {}
+
+    with file_lock(TRANSCRIPT_OFFSETS):
+        offsets = {}
+        if TRANSCRIPT_OFFSETS.exists():
+            try:
+                offsets = json.loads(TRANSCRIPT_OFFSETS.read_text())
+            except (json.JSONDecodeError, ValueError):
+                offsets = {}
+
+        record = offsets.get(session_id, {})
+        offset = record.get('offset', 0)
+        with open(transcript_path, 'rb') as f:
+            f.seek(0, 2)
+            if f.tell() < offset:
+                offset = 0  # transcript was replaced
+            f.seek(offset)
+            chunk = f.read()
+
+        # Only consume complete lines; a partial last line is read next time
+        end = chunk.rfind(b'\n') + 1
+        last_id = record.get('last_message_id')
+        seen_ids = {last_id} if last_id else set()
+        lines = chunk[:end].splitlines()
+        usage = parse_usage(lines, seen_ids)
+
+        for line in reversed(lines):
+            if b'"usage"' in line:
+                try:
+                    last_id = json.loads(line).get('message', {}).get('id') or last_id
+                except (json.JSONDecodeError, ValueError, AttributeError):
+                    pass
+                break
+
+        now = time.time()
+        offsets[session_id] = {'offset': offset + end, 'last_message_id': last_id, 'seen': now}
+        for sid, rec in list(offsets.items()):
+            if now - rec.get('seen', now) > OFFSET_TTL_SECONDS:
+                del offsets[sid]
+        TRANSCRIPT_OFFSETS.write_text(json.dumps(offsets))
+
+    return usage
+
+
+def update_spend_totals(cost: float):
+    """
+    Add this Stop's cost to today's running total.
+
+    budget_guard.py reads the file on every prompt without locking, so it
+    is replaced atomically and never holds more than a week of entries.
+    """
+    today = date.today()
+    with file_lock(SPEND_TOTALS):
+        try:
+            totals = json.loads(SPEND_TOTALS.read_text())
+        except (OSError, json.JSONDecodeError, ValueError):
+            totals = {}
+        days = totals.get('days', {})
+        key = today.isoformat()
+        days[key] = round(days.get(key, 0.0) + cost, 6)
+
+        oldest = (today - timedelta(days=SPEND_WINDOW_DAYS - 1)).isoformat()
+        totals['days'] = {day: spent for day, spent in days.items() if day >= oldest}
+        totals['updated'] = datetime.now().isoformat()
+
+        write_atomic(SPEND_TOTALS, json.dumps(totals))
+
 
 class CostTracker:
     """Track and log token usage costs."""
@@ -41,22 +189,26 @@ class CostTracker:
         today = date.today().isoformat()
         daily_file = DAILY_LOG / f'{today}.json'
 
-        # Load existing daily data
-        if daily_file.exists():
-            daily_data = json.loads(daily_file.read_text())
-        else:
-            daily_data = {'date': today, 'sessions': [], 'totals': {}}
-
-        # Add session
-        daily_data['sessions'].append({
-            'session_id': session_data.get('session_id', 'unknown'),
-            'timestamp': datetime.now().isoformat(),
-            'commands': session_data.get('commands', []),
-            'duration_seconds': session_data.get('duration', 0),
-        })
-
-        # Save
-        daily_file.write_text(json.dumps(daily_data, indent=2))
+        # Parallel sessions share the daily file
+        with file_lock(daily_file):
+            # Load existing daily data
+            if daily_file.exists():
+                daily_data = json.loads(daily_file.read_text())
+            else:
+                daily_data = {'date': today, 'sessions': [], 'totals': {}}
+
+            # Add session
+            daily_data['sessions'].append({
+                'session_id': session_data.get('session_id', 'unknown'),
+                'timestamp': datetime.now().isoformat(),
+                'commands': session_data.get('commands', []),
+                'duration_seconds': session_data.get('duration', 0),
+                'usage': session_data.get('usage', {}),
+                'cost_usd': round(session_data.get('cost_usd', 0.0), 6),
+            })
+
+            # Save
+            daily_file.write_text(json.dumps(daily_data, indent=2))
 
     def get_daily_summary(self, day: Optional[str] = None) -> Dict[str, Any]:
         """Get usage summary for a day."""
@@ -64,13 +216,14 @@ class CostTracker:
         daily_file = DAILY_LOG / f'{day}.json'
 
         if not daily_file.exists():
-            return {'date': day, 'sessions': 0, 'commands': {}}
+            return {'date': day, 'sessions': 0, 'commands': {}, 'cost_usd': 0.0}
 
         data = json.loads(daily_file.read_text())
         return {
             'date': day,
             'sessions': len(data.get('sessions', [])),
             'commands': self._count_commands(data),
+            'cost_usd': sum(s.get('cost_usd', 0.0) for s in data.get('sessions', [])),
         }
 
     def get_weekly_summary(self) -> Dict[str, Any]:
@@ -150,6 +303,8 @@ def format_usage_output(tracker: CostTracker) -> str:
     output += "TODAY'S USAGE\n"
     output += "-" * 50 + "\n"
     output += f"Sessions: {summary['sessions']}\n"
+    if summary['cost_usd']:
+        output += f"Estimated cost: ${summary['cost_usd']:.2f}\n"
 
     if summary['commands']:
         output += "Commands:\n"
@@ -161,22 +316,49 @@ def format_usage_output(tracker: CostTracker) -> str:
     return output
 
 
+def track_stop(input_data: Dict[str, Any]) -> str:
+    """Record one Stop event everywhere it is tracked and return the summary."""
+    tracker = CostTracker()
+    session_id = input_data.get('session_id', 'unknown')
+    commands = input_data.get('commands', [])
+
+    usage = read_new_usage(session_id, input_data.get('transcript_path'))
+    cost_by_model = {model: estimate_cost(model, tokens) for model, tokens in usage.items()}
+
+    # Log session
+    tracker.log_session({
+        'session_id': session_id,
+        'commands': commands,
+        'duration': input_data.get('duration', 0),
+        'usage': usage,
+        'cost_usd': sum(cost_by_model.values()),
+    })
+
+    # Keep the budget guard's running total current
+    update_spend_totals(sum(cost_by_model.values()))
+
+    # Refresh the metrics textfile
+    MetricsExporter().update(session_id, commands, usage, cost_by_model)
+
+    return format_usage_output(tracker)
+
+
 def main():
     """Hook entry point - runs on Stop event."""
     try:
         input_data = json.load(sys.stdin)
 
-        tracker = CostTracker()
-
-        # Log session
-        tracker.log_session({
-            'session_id': input_data.get('session_id', 'unknown'),
-            'commands': input_data.get('commands', []),
-            'duration': input_data.get('duration', 0),
-        })
+        # On a huge transcript the rollup finishes in the background and the
+        # previous summary is shown instead
+        guard = DeadlineGuard('cost_tracker', 'summary')
+        try:
+            output = guard.run(lambda: track_stop(input_data))
+        except DeadlineExceeded as exc:
+            output = exc.fallback
 
         # Output daily summary
-        print(format_usage_output(tracker))
+        if output:
+            print(output)
 
         sys.exit(0)
 
@@ -185,4 +367,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    with hook_timer('cost_tracker'):
+        main()
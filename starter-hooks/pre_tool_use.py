@@ -7,10 +7,14 @@ import json
 import sys
 import re
 import os
+import random
 from pathlib import Path
 
 from utils.constants import ensure_session_log_dir
 
+# Log only a fraction of calls for chatty tools, e.g. "Read=0.1,Grep=0.25"
+LOG_SAMPLE = os.environ.get('CLAUDE_HOOKS_LOG_SAMPLE', '')
+
 def is_dangerous_rm_command(command):
     """
     Comprehensive detection of dangerous rm commands.
@@ -96,6 +100,20 @@ def log_skill_activation(skill_name):
 
     print(f"\n{CYAN}{BOLD}{ICON} Skill activated: {skill_name}{RESET}\n", file=sys.stderr)
 
+def get_log_sample_rate(tool_name):
+    """
+    Fraction of this tool's calls to log, from CLAUDE_HOOKS_LOG_SAMPLE.
+    Tools not listed are always logged.
+    """
+    for item in LOG_SAMPLE.split(','):
+        name, _, rate = item.partition('=')
+        if name.strip() == tool_name:
+            try:
+                return max(0.0, min(1.0, float(rate)))
+            except ValueError:
+                return 1.0
+    return 1.0
+
 def main():
     try:
         # Read JSON input from stdin
@@ -124,6 +142,13 @@ def main():
                 print("BLOCKED: Dangerous rm command detected and prevented", file=sys.stderr)
                 sys.exit(2)  # Exit code 2 blocks tool call and shows error to Claude
         
+        # Sample chatty tools (security checks above always run)
+        sample_rate = get_log_sample_rate(tool_name)
+        if sample_rate < 1.0:
+            if random.random() >= sample_rate:
+                sys.exit(0)
+            input_data['log_sample_rate'] = sample_rate
+
         # Extract session_id
         session_id = input_data.get('session_id', 'unknown')
         
@@ -141,8 +166,13 @@ def main():
         else:
             log_data = []
         
-        # Append new data
-        log_data.append(input_data)
+        # Append new data, large fields (e.g. Write content) go to the blob store.
+        # Imported here so a missing/broken blob_store can't stop the checks above
+        try:
+            from utils.blob_store import externalize
+            log_data.append(externalize(input_data))
+        except Exception:
+            log_data.append(input_data)
         
         # Write back to file with formatting
         with open(log_path, 'w') as f:
@@ -158,4 +188,13 @@ def main():
         sys.exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # Metrics are optional here: a broken metrics/profiling import must not
+    # skip the safety checks in main()
+    try:
+        from utils.metrics import hook_timer
+        timer = hook_timer('pre_tool_use')
+    except Exception:
+        from contextlib import nullcontext
+        timer = nullcontext()
+    with timer:
+        main()
\ No newline at end of file
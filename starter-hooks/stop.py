@@ -10,24 +10,38 @@ import argparse
 import json
 import os
 import sys
-import random
-import subprocess
 from pathlib import Path
-from datetime import datetime
 
 from utils.constants import ensure_session_log_dir
+from utils.metrics import hook_timer
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
 
+def find_env_file():
+    """Nearest .env in the working directory or its parents, as dotenv's find_dotenv() searches."""
+    cwd = Path.cwd()
+    for directory in (cwd, *cwd.parents):
+        candidate = directory / '.env'
+        if candidate.is_file():
+            return candidate
+    return None
 
 
+def load_env():
+    """Load .env if python-dotenv is available (imported lazily, it is optional)."""
+    env_file = find_env_file()
+    if env_file is None:
+        return  # nothing to load - skip importing dotenv
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(env_file)
+    except ImportError:
+        pass  # dotenv is optional
+
 
 def main():
     try:
+        load_env()
+
         # Parse command line arguments
         parser = argparse.ArgumentParser()
         parser.add_argument('--chat', action='store_true', help='Copy transcript to chat.json')
@@ -96,4 +110,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with hook_timer("stop"):
+        main()
\ No newline at end of file
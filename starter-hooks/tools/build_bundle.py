@@ -0,0 +1,257 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Build a prebuilt, bytecode-compiled bundle of the hooks.
+
+`uv run` resolves each hook's `# /// script` environment on every call.
+This packs the hooks, `utils/` and their vendored dependencies into one
+zipapp with precompiled bytecode, so settings.json can run them with plain
+`python3 -S`:
+
+    python3 -S .claude/hooks/hooks.pyz context_loader
+
+Usage:
+    uv run tools/build_bundle.py [--hooks-dir .claude/hooks]
+                                 [--output .claude/hooks/hooks.pyz]
+                                 [--python python3]
+                                 [--no-vendor] [--write-settings .claude/settings.json]
+                                 [--bench 20]
+
+Bytecode is compiled by --python (default `python3`), the interpreter that
+--write-settings puts in the hook commands and --bench times - not the one
+`uv run` builds with. Run by another Python version, the bundle silently
+recompiles its sources on every call.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import List
+
+DEFAULT_HOOKS_DIR = Path('.claude/hooks')
+BUNDLE_NAME = 'hooks.pyz'
+
+SCRIPT_BLOCK = re.compile(r'^# /// script\s*$(.*?)^# ///\s*$', re.MULTILINE | re.DOTALL)
+DEPENDENCY = re.compile(r'^#\s+"([^"]+)",?\s*$', re.MULTILINE)
+UV_COMMAND = re.compile(r'uv run (\S*?)([\w-]+)\.py')
+
+MAIN_PY = '''\
+import runpy
+import sys
+
+
+def run():
+    if len(sys.argv) < 2:
+        print("usage: python3 -S hooks.pyz <hook> [args...]", file=sys.stderr)
+        sys.exit(0)
+    hook = sys.argv[1]
+    sys.argv = [hook] + sys.argv[2:]
+    runpy.run_module(hook, run_name='__main__', alter_sys=True)
+
+
+run()
+'''
+
+# Run by the target interpreter: python -c COMPILE_PY <staging dir>
+COMPILE_PY = '''\
+import pathlib
+import py_compile
+import sys
+
+staging = pathlib.Path(sys.argv[1])
+for source in staging.rglob('*.py'):
+    py_compile.compile(
+        str(source),
+        cfile=str(source.with_suffix('.pyc')),
+        dfile=str(source.relative_to(staging)),
+        doraise=True,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+'''
+
+# Representative stdin payloads for --bench
+HOOK_PAYLOADS = {
+    'context_loader': {'hook_event_name': 'UserPromptSubmit', 'prompt': 'implement the login form in src/components/Login.tsx'},
+    'context_detector': {'hook_event_name': 'UserPromptSubmit', 'prompt': 'implement the login form in src/components/Login.tsx'},
+    'pre_tool_use': {'hook_event_name': 'PreToolUse', 'tool_name': 'Bash', 'tool_input': {'command': 'ls -la'}},
+    'stop': {'hook_event_name': 'Stop', 'stop_hook_active': False},
+    'cost_tracker': {'hook_event_name': 'Stop', 'stop_hook_active': False},
+}
+
+
+def find_hooks(hooks_dir: Path) -> List[Path]:
+    """Top-level hook scripts in the hooks directory."""
+    return sorted(p for p in hooks_dir.glob('*.py') if not p.name.startswith('_'))
+
+
+def read_dependencies(hooks: List[Path]) -> List[str]:
+    """Collect dependencies declared in the hooks' `# /// script` headers."""
+    deps = set()
+    for hook in hooks:
+        match = SCRIPT_BLOCK.search(hook.read_text())
+        if match:
+            block = match.group(1)
+            if 'dependencies' in block:
+                deps.update(DEPENDENCY.findall(block.split('dependencies', 1)[1]))
+    return sorted(deps)
+
+
+def vendor_dependencies(deps: List[str], target: Path, python: str):
+    """Install pure-Python copies of the dependencies into the staging dir."""
+    if not deps:
+        return
+    if shutil.which('uv'):
+        cmd = ['uv', 'pip', 'install', '--quiet', '--python', python, '--target', str(target), *deps]
+    else:
+        cmd = [python, '-m', 'pip', 'install', '--quiet', '--no-compile', '--target', str(target), *deps]
+    subprocess.run(cmd, check=True)
+
+    # Extension modules cannot be imported from a zip; packages such as
+    # pyyaml fall back to their pure-Python implementation without them.
+    for pattern in ('*.so', '*.pyd', '*.dylib'):
+        for ext in target.rglob(pattern):
+            ext.unlink()
+    for meta in list(target.glob('*.dist-info')) + [target / 'bin']:
+        if meta.exists():
+            shutil.rmtree(meta)
+
+
+def stage_sources(hooks_dir: Path, hooks: List[Path], staging: Path):
+    """Copy hooks and utils/ into the staging dir."""
+    for hook in hooks:
+        shutil.copy2(hook, staging / hook.name)
+    utils_dir = hooks_dir / 'utils'
+    if utils_dir.is_dir():
+        shutil.copytree(utils_dir, staging / 'utils', ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+    (staging / '__main__.py').write_text(MAIN_PY)
+
+
+def compile_sources(staging: Path, python: str):
+    """
+    Precompile every module next to its source (legacy .pyc layout, which
+    is what zipimport looks for) with the interpreter that will run the
+    bundle, so the pyc magic number matches. Unchecked hash-based pycs
+    skip the mtime comparison, so zip timestamps don't matter.
+    """
+    subprocess.run([python, '-c', COMPILE_PY, str(staging)], check=True)
+
+
+def write_bundle(staging: Path, output: Path):
+    """Zip the staging dir into a runnable zipapp (atomically replaced)."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_output = output.with_suffix(output.suffix + '.tmp')
+    with zipfile.ZipFile(tmp_output, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(staging.rglob('*')):
+            if path.is_file() and '__pycache__' not in path.parts:
+                zf.write(path, path.relative_to(staging).as_posix())
+    os.replace(tmp_output, output)
+
+
+def rewrite_settings(settings_path: Path, bundle: Path, python: str):
+    """Point `uv run .claude/hooks/<hook>.py` commands at the bundle."""
+    settings = json.loads(settings_path.read_text())
+    bundle_path = bundle.as_posix()
+
+    for groups in settings.get('hooks', {}).values():
+        for group in groups:
+            for hook in group.get('hooks', []):
+                command = hook.get('command', '')
+                hook['command'] = UV_COMMAND.sub(lambda m: f'{python} -S {bundle_path} {m.group(2)}', command)
+
+    settings_path.write_text(json.dumps(settings, indent=2) + '\n')
+
+
+def time_command(cmd: List[str], payload: dict, cwd: Path, runs: int) -> float:
+    """Median wall time in ms of a hook invocation, cold process each run."""
+    data = json.dumps({'session_id': 'bench', **payload}).encode()
+    env = dict(os.environ, CLAUDE_HOOKS_LOG_DIR=str(cwd / 'logs'))
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, input=data, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(hooks_dir: Path, hooks: List[Path], bundle: Path, runs: int, python: str) -> str:
+    """Compare cold-start time per hook: script runner vs. prebuilt bundle."""
+    runner = ['uv', 'run', '--script'] if shutil.which('uv') else [python]
+    runner_name = 'uv run' if shutil.which('uv') else Path(python).name
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # Realistic inputs: reuse the project's contexts and memory if present
+        for sub in ('contexts', 'memory'):
+            src = Path('.claude') / sub
+            if src.is_dir():
+                shutil.copytree(src, workdir / '.claude' / sub)
+
+        lines = [
+            f"{'hook':<20} {runner_name + ' (ms)':>14} {'bundle (ms)':>12} {'speedup':>8}",
+            '-' * 57,
+        ]
+        for hook in hooks:
+            payload = HOOK_PAYLOADS.get(hook.stem, {})
+            before = time_command([*runner, str(hook.resolve())], payload, workdir, runs)
+            after = time_command([python, '-S', str(bundle.resolve()), hook.stem], payload, workdir, runs)
+            lines.append(f"{hook.stem:<20} {before:>14.1f} {after:>12.1f} {before / after:>7.1f}x")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a precompiled zipapp of the hooks.')
+    parser.add_argument('--hooks-dir', type=Path, default=DEFAULT_HOOKS_DIR, help='Directory containing the hook scripts')
+    parser.add_argument('--output', type=Path, help=f'Bundle path (default: <hooks-dir>/{BUNDLE_NAME})')
+    parser.add_argument('--python', default='python3',
+                        help='Interpreter that runs the bundle: compiles it, goes into settings, is benchmarked (default python3)')
+    parser.add_argument('--no-vendor', action='store_true', help='Do not vendor declared dependencies')
+    parser.add_argument('--write-settings', type=Path, help='Rewrite uv run commands in this settings.json to use the bundle')
+    parser.add_argument('--bench', type=int, metavar='RUNS', help='Measure cold-start time before/after for each hook')
+    args = parser.parse_args()
+
+    hooks_dir = args.hooks_dir
+    output = args.output or hooks_dir / BUNDLE_NAME
+    hooks = find_hooks(hooks_dir)
+    if not hooks:
+        print(f"No hooks found in {hooks_dir}", file=sys.stderr)
+        sys.exit(1)
+    if not shutil.which(args.python):
+        print(f"Interpreter not found: {args.python}", file=sys.stderr)
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp)
+        stage_sources(hooks_dir, hooks, staging)
+        deps = [] if args.no_vendor else read_dependencies(hooks)
+        vendor_dependencies(deps, staging, args.python)
+        compile_sources(staging, args.python)
+        write_bundle(staging, output)
+
+    print(f"Built {output} ({output.stat().st_size // 1024} KB): {', '.join(h.stem for h in hooks)}")
+    if deps:
+        print(f"Vendored: {', '.join(deps)}")
+
+    if args.write_settings:
+        rewrite_settings(args.write_settings, output, args.python)
+        print(f"Updated {args.write_settings}")
+
+    if args.bench:
+        print()
+        print(bench(hooks_dir, hooks, output, args.bench, args.python))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.9"
+# dependencies = [
+#     "pyyaml",
+# ]
+# ///
+
+"""
+Multi-session load test for shared-file contention between hooks.
+
+Simulates N concurrent sessions against one checkout. Each session is a
+separate process that replays a realistic event stream through the real
+hook scripts - per turn: UserPromptSubmit (context_loader,
+context_detector), several PreToolUse calls, then Stop (stop,
+cost_tracker) after appending usage to its transcript.
+
+For each concurrency level it reports throughput, per-hook tail latency,
+lock wait (from utils/locking.py's CLAUDE_HOOKS_LOCK_STATS), deadline hits
+and data loss - Stop events, tokens and tool calls that should have been
+recorded but weren't - and where scaling breaks down.
+
+Usage:
+    uv run tools/loadtest.py [--levels 1,2,4,8,16,32,64] [--turns 5] [--tools 4]
+                             [--hooks-dir starter-hooks] [--bundle .claude/hooks/hooks.pyz]
+                             [--json report.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_HOOKS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+
+# Below this fraction of linear scaling, contention is reported as the limit
+SCALING_THRESHOLD = 0.5
+
+# Lock wait above this share of total hook time marks a level as lock-bound
+LOCK_BOUND_SHARE = 0.1
+
+PROMPTS = [
+    'implement the login form component in src/components/LoginForm.tsx',
+    'fix the failing test in src/api/orders.test.ts',
+    'refactor the data table hook to support pagination',
+    'what does this function do?',
+    'add validation to the checkout form and update the tests',
+]
+TOOL_CALLS = [
+    ('Read', {'file_path': 'src/components/LoginForm.tsx'}),
+    ('Grep', {'pattern': 'useForm', 'path': 'src'}),
+    ('Edit', {'file_path': 'src/components/LoginForm.tsx', 'old_string': 'a', 'new_string': 'b'}),
+    ('Bash', {'command': 'pnpm test -- LoginForm'}),
+]
+TOKENS_PER_TURN = {'input_tokens': 1200, 'output_tokens': 400, 'cache_read_input_tokens': 8000}
+
+FRONTEND_CONTEXT = """\
+name: frontend
+indicators:
+  paths: ["src/components", "src/features"]
+  extensions: [".tsx", ".ts"]
+  keywords: ["component", "react", "form", "hook"]
+project_root: "."
+tools:
+  verify: ["pnpm tsc --noEmit"]
+  test: "pnpm test"
+agents:
+  implementer: implementer-fe
+"""
+
+
+def prepare_workspace(workdir: Path):
+    """Project checkout shared by all sessions: memory and context configs."""
+    for sub in ('memory', 'contexts'):
+        src = Path('.claude') / sub
+        if src.is_dir():
+            shutil.copytree(src, workdir / '.claude' / sub)
+
+    memory = workdir / '.claude' / 'memory'
+    if not memory.exists():
+        memory.mkdir(parents=True)
+        for name in ('decisions.md', 'lessons.md', 'conventions.md'):
+            (memory / name).write_text(f"# {name}\n" + "".join(f"- entry {i}\n" for i in range(60)))
+    contexts = workdir / '.claude' / 'contexts'
+    if not contexts.exists():
+        contexts.mkdir(parents=True)
+        (contexts / 'frontend.yaml').write_text(FRONTEND_CONTEXT)
+
+
+def invoke(cmd: list[str], payload: dict, workdir: Path, env: dict) -> tuple[float, int]:
+    """Run one hook with a JSON payload; return (latency seconds, exit code)."""
+    data = json.dumps(payload).encode()
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, input=data, cwd=workdir, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start, proc.returncode
+
+
+def run_session(args: tuple) -> dict:
+    """One simulated session: replay `turns` turns through the hooks."""
+    index, workdir, hook_cmds, env, turns, tools = args
+    workdir = Path(workdir)
+    session_id = f'load-{index:03d}'
+    transcript = workdir / 'transcripts' / f'{session_id}.jsonl'
+    transcript.parent.mkdir(parents=True, exist_ok=True)
+    latencies = defaultdict(list)
+    base = {'session_id': session_id, 'transcript_path': str(transcript), 'cwd': str(workdir)}
+
+    for turn in range(turns):
+        prompt = PROMPTS[(index + turn) % len(PROMPTS)]
+        for hook in ('context_loader', 'context_detector'):
+            payload = {**base, 'hook_event_name': 'UserPromptSubmit', 'prompt': prompt}
+            latencies[hook].append(invoke(hook_cmds[hook], payload, workdir, env)[0])
+
+        for call in range(tools):
+            tool_name, tool_input = TOOL_CALLS[call % len(TOOL_CALLS)]
+            payload = {**base, 'hook_event_name': 'PreToolUse', 'tool_name': tool_name, 'tool_input': tool_input}
+            latencies['pre_tool_use'].append(invoke(hook_cmds['pre_tool_use'], payload, workdir, env)[0])
+
+        with open(transcript, 'a') as f:
+            f.write(json.dumps({'type': 'user', 'message': {'content': prompt}}) + '\n')
+            f.write(json.dumps({'type': 'assistant', 'message': {
+                'id': f'{session_id}-{turn}', 'model': 'claude-sonnet-4-20250514', 'usage': TOKENS_PER_TURN,
+            }}) + '\n')
+
+        for hook in ('stop', 'cost_tracker'):
+            payload = {**base, 'hook_event_name': 'Stop', 'stop_hook_active': False}
+            latencies[hook].append(invoke(hook_cmds[hook], payload, workdir, env)[0])
+
+    return dict(latencies)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError, ValueError):
+        return default
+
+
+def measure_loss(workdir: Path, sessions: int, turns: int, tools: int, settle_seconds: float) -> dict:
+    """Compare what should have been recorded with what is on disk."""
+    expected_stops = sessions * turns
+    metrics = workdir / '.claude' / 'metrics'
+    daily_file = metrics / 'daily' / f'{date.today().isoformat()}.json'
+
+    # Guarded hooks may still be finishing in detached workers
+    deadline = time.monotonic() + settle_seconds
+    while time.monotonic() < deadline:
+        if read_json(metrics / 'exporter_state.json', {}).get('stop_events', 0) >= expected_stops:
+            break
+        time.sleep(0.1)
+
+    daily_records = len(read_json(daily_file, {}).get('sessions', []))
+    exporter = read_json(metrics / 'exporter_state.json', {})
+    recorded_tokens = sum(sum(t.values()) for t in exporter.get('tokens', {}).values())
+    expected_tokens = expected_stops * sum(TOKENS_PER_TURN.values())
+
+    logs = workdir / 'logs'
+    tool_calls = sum(len(read_json(p, [])) for p in logs.glob('load-*/pre_tool_use.json'))
+    stop_logs = sum(len(read_json(p, [])) for p in logs.glob('load-*/stop.json'))
+
+    def lost(expected: int, actual: int) -> dict:
+        return {'expected': expected, 'actual': actual, 'lost': max(0, expected - actual)}
+
+    return {
+        'daily_records': lost(expected_stops, daily_records),
+        'exporter_stop_events': lost(expected_stops, exporter.get('stop_events', 0)),
+        'tokens': lost(expected_tokens, recorded_tokens),
+        'tool_call_logs': lost(sessions * turns * tools, tool_calls),
+        'stop_logs': lost(expected_stops, stop_logs),
+    }
+
+
+def read_lock_waits(stats_file: Path) -> dict[str, list[float]]:
+    waits = defaultdict(list)
+    if stats_file.exists():
+        for line in stats_file.read_text().splitlines():
+            name, _, seconds = line.partition('\t')
+            try:
+                waits[name].append(float(seconds))
+            except ValueError:
+                continue
+    return waits
+
+
+def normalize_lock_name(name: str) -> str:
+    """Group per-day and per-session lock files under one name."""
+    if name[:4].isdigit() and name.endswith('.json.lock'):
+        return 'daily/<date>.json.lock'
+    return name
+
+
+def run_level(n: int, hook_cmds: dict, turns: int, tools: int, settle_seconds: float) -> dict:
+    """Run N concurrent sessions in a fresh workspace and collect results."""
+    with tempfile.TemporaryDirectory(prefix=f'loadtest-{n}-') as tmp:
+        workdir = Path(tmp)
+        prepare_workspace(workdir)
+        stats_file = workdir / 'lock_waits.tsv'
+        # Per-level content cache, so each level starts cold and the user's cache is untouched
+        env = dict(os.environ, CLAUDE_HOOKS_LOCK_STATS=str(stats_file), CLAUDE_HOOKS_LOG_DIR=str(workdir / 'logs'),
+                   CLAUDE_HOOKS_CACHE_DIR=str(workdir / 'cache'))
+        env.pop('CLAUDE_METRICS_TEXTFILE', None)
+
+        tasks = [(i, str(workdir), hook_cmds, env, turns, tools) for i in range(n)]
+        start = time.perf_counter()
+        with multiprocessing.Pool(processes=n) as pool:
+            results = pool.map(run_session, tasks)
+        wall = time.perf_counter() - start
+
+        latencies = defaultdict(list)
+        for result in results:
+            for hook, samples in result.items():
+                latencies[hook].extend(samples)
+
+        hits_file = workdir / 'logs' / 'deadline_hits.jsonl'
+        deadline_hits = len(hits_file.read_text().splitlines()) if hits_file.exists() else 0
+
+        loss = measure_loss(workdir, n, turns, tools, settle_seconds)
+
+        # After measure_loss has let detached workers finish, so their lock waits are counted
+        waits = defaultdict(list)
+        for name, samples in read_lock_waits(stats_file).items():
+            waits[normalize_lock_name(name)].extend(samples)
+
+    invocations = sum(len(s) for s in latencies.values())
+    return {
+        'sessions': n,
+        'wall_seconds': wall,
+        'invocations': invocations,
+        'hook_seconds': sum(sum(s) for s in latencies.values()),
+        'throughput': invocations / wall if wall else 0.0,
+        'latency': {hook: {'p50': percentile(s, 50), 'p95': percentile(s, 95), 'p99': percentile(s, 99),
+                           'max': max(s)} for hook, s in sorted(latencies.items())},
+        'lock_wait': {name: {'count': len(s), 'total': sum(s), 'p50': percentile(s, 50),
+                             'p99': percentile(s, 99), 'max': max(s)} for name, s in sorted(waits.items())},
+        'deadline_hits': deadline_hits,
+        'loss': loss,
+    }
+
+
+def format_report(levels: list[dict]) -> str:
+    base = levels[0]
+    base_per_session = base['throughput'] / base['sessions'] if base['throughput'] else 0.0
+    lines = ['', 'THROUGHPUT AND SCALING', '-' * 78,
+             f"{'N':>4} {'wall s':>8} {'hooks/s':>9} {'efficiency':>11} {'p99 ms (worst hook)':>22} {'deadline':>9} {'lost':>6}",
+             '-' * 78]
+
+    limit: Optional[int] = None
+    for level in levels:
+        efficiency = level['throughput'] / (base_per_session * level['sessions']) if base_per_session else 0.0
+        level['efficiency'] = efficiency
+        worst_hook, worst = max(level['latency'].items(), key=lambda item: item[1]['p99'])
+        lost = sum(v['lost'] for v in level['loss'].values())
+        lines.append(f"{level['sessions']:>4} {level['wall_seconds']:>8.2f} {level['throughput']:>9.1f} "
+                     f"{efficiency:>10.0%} {worst['p99'] * 1000:>12.1f} ({worst_hook[:8]}) "
+                     f"{level['deadline_hits']:>9} {lost:>6}")
+        if limit is None and efficiency < SCALING_THRESHOLD:
+            limit = level['sessions']
+
+    for level in levels:
+        lines += ['', f"N = {level['sessions']}", f"  {'hook':<18} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for hook, stats in level['latency'].items():
+            lines.append(f"  {hook:<18} {stats['p50'] * 1000:>8.1f} {stats['p95'] * 1000:>8.1f} "
+                         f"{stats['p99'] * 1000:>8.1f} {stats['max'] * 1000:>8.1f}")
+        if level['lock_wait']:
+            lines.append(f"  {'lock':<30} {'waits':>6} {'total ms':>9} {'p99 ms':>8} {'max ms':>8}")
+            for name, stats in level['lock_wait'].items():
+                lines.append(f"  {name:<30} {stats['count']:>6} {stats['total'] * 1000:>9.1f} "
+                             f"{stats['p99'] * 1000:>8.1f} {stats['max'] * 1000:>8.1f}")
+        losses = {k: v for k, v in level['loss'].items() if v['lost']}
+        for name, v in losses.items():
+            lines.append(f"  LOST {name}: {v['lost']} of {v['expected']}")
+
+    lines.append('')
+    if limit is None:
+        lines.append(f"Scaling stayed above {SCALING_THRESHOLD:.0%} of linear up to N = {levels[-1]['sessions']}.")
+    else:
+        at_limit = next(level for level in levels if level['sessions'] == limit)
+        lock_total = sum(stats['total'] for stats in at_limit['lock_wait'].values())
+        lock_share = lock_total / at_limit['hook_seconds'] if at_limit['hook_seconds'] else 0.0
+        lines.append(f"Scaling drops below {SCALING_THRESHOLD:.0%} of linear at N = {limit}.")
+        if lock_share >= LOCK_BOUND_SHARE:
+            worst_lock = max(at_limit['lock_wait'].items(), key=lambda item: item[1]['total'])
+            lines.append(f"Lock-bound: waiting on locks is {lock_share:.0%} of hook time, "
+                         f"most on {worst_lock[0]} ({worst_lock[1]['total'] * 1000:.0f} ms total).")
+        else:
+            lines.append(f"Not lock-bound: lock waits are {lock_share:.1%} of hook time; with "
+                         f"{os.cpu_count()} CPU(s) the limit is process startup and CPU.")
+    return "\n".join(lines)
+
+
+def hook_commands(hooks_dir: Path, bundle: Optional[Path]) -> dict[str, list[str]]:
+    hooks = ('context_loader', 'context_detector', 'pre_tool_use', 'stop', 'cost_tracker')
+    if bundle:
+        return {h: [sys.executable, '-S', str(bundle.resolve()), h] for h in hooks}
+    return {h: [sys.executable, str((hooks_dir / f'{h}.py').resolve())] for h in hooks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test hooks with N concurrent sessions.')
+    parser.add_argument('--levels', default=','.join(map(str, DEFAULT_LEVELS)), help='Comma-separated session counts')
+    parser.add_argument('--turns', type=int, default=5, help='Turns per session')
+    parser.add_argument('--tools', type=int, default=4, help='PreToolUse calls per turn')
+    parser.add_argument('--hooks-dir', type=Path, default=DEFAULT_HOOKS_DIR)
+    parser.add_argument('--bundle', type=Path, help='Run hooks from a build_bundle.py zipapp instead')
+    parser.add_argument('--settle', type=float, default=10.0, help='Seconds to wait for background workers')
+    parser.add_argument('--json', type=Path, help='Also write the raw results here')
+    args = parser.parse_args()
+
+    levels = [int(n) for n in args.levels.split(',') if n.strip()]
+    hook_cmds = hook_commands(args.hooks_dir, args.bundle)
+
+    results = []
+    for n in levels:
+        print(f"Running N = {n} ...", file=sys.stderr)
+        results.append(run_level(n, hook_cmds, args.turns, args.tools, args.settle))
+
+    print(format_report(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
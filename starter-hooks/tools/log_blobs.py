@@ -0,0 +1,95 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.9"
+# ///
+
+"""
+Inspect and maintain the blob store behind pre_tool_use logs.
+
+    uv run tools/log_blobs.py report            # log size with vs. without the blob store
+    uv run tools/log_blobs.py migrate           # externalize logs written before the store existed
+    uv run tools/log_blobs.py show <session_id> # print a session's log with values rehydrated
+
+Reads the same log directory as the hooks (CLAUDE_HOOKS_LOG_DIR, default `logs`).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.blob_store import BLOB_DIR, externalize, load_log, rehydrate  # noqa: E402
+from utils.constants import LOG_BASE_DIR, get_session_log_dir  # noqa: E402
+
+LOG_NAME = 'pre_tool_use.json'
+
+
+def session_logs() -> list[Path]:
+    return sorted(Path(LOG_BASE_DIR).glob(f'*/{LOG_NAME}'))
+
+
+def cmd_report(args):
+    """Compare current on-disk size against the fully inline format."""
+    logs = session_logs()
+    if not logs:
+        print(f"No {LOG_NAME} files under {LOG_BASE_DIR}/")
+        return
+
+    inline_total = 0
+    stored_total = 0
+    calls = 0
+    for path in logs:
+        entries = load_log(path, rehydrated=False)
+        calls += len(entries)
+        stored_total += path.stat().st_size
+        inline_total += len(json.dumps(rehydrate(entries), indent=2).encode('utf-8'))
+
+    blob_files = list(BLOB_DIR.glob('*/*.zz'))
+    blob_total = sum(p.stat().st_size for p in blob_files)
+    with_store = stored_total + blob_total
+
+    print(f"Sessions:              {len(logs)}")
+    print(f"Tool calls logged:     {calls}")
+    print(f"Inline logs (before):  {inline_total / 1024:,.1f} KB")
+    print(f"Logs with references:  {stored_total / 1024:,.1f} KB")
+    print(f"Blob store:            {blob_total / 1024:,.1f} KB ({len(blob_files)} blobs)")
+    if inline_total:
+        print(f"Reduction:             {1 - with_store / inline_total:.1%}")
+
+
+def cmd_migrate(args):
+    """Rewrite existing logs with large values moved to the store."""
+    before = after = 0
+    for path in session_logs():
+        entries = load_log(path, rehydrated=False)
+        before += path.stat().st_size
+        path.write_text(json.dumps(externalize(entries), indent=2))
+        after += path.stat().st_size
+    print(f"Migrated logs: {before / 1024:,.1f} KB -> {after / 1024:,.1f} KB inline")
+
+
+def cmd_show(args):
+    path = get_session_log_dir(args.session_id) / LOG_NAME
+    entries = load_log(path)
+    if args.index is not None:
+        entries = entries[args.index]
+    print(json.dumps(entries, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the pre_tool_use blob store.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('report', help='Measure log size reduction').set_defaults(func=cmd_report)
+    sub.add_parser('migrate', help='Externalize large values in existing logs').set_defaults(func=cmd_migrate)
+    show = sub.add_parser('show', help='Print a rehydrated session log')
+    show.add_argument('session_id')
+    show.add_argument('--index', type=int, help='Only this entry (negative counts from the end)')
+    show.set_defaults(func=cmd_show)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.9"
+# dependencies = [
+#     "numpy",
+# ]
+# ///
+
+"""
+Merge many developers' .claude/metrics trees into one columnar store and
+answer team-level aggregations.
+
+Sources are directories (e.g. a shared drive with one folder per developer)
+or tarballs of a project's .claude/ directory. Every daily record is
+flattened into NumPy column arrays and saved as a single .npz store.
+Records are deduplicated by (session_id, timestamp), so ingesting the same
+tree twice - or overlapping exports - never double-counts.
+
+Usage:
+    uv run tools/metrics_merge.py ingest --store team.npz /shared/metrics alice.tar.gz
+    uv run tools/metrics_merge.py report --store team.npz --by developer --metric cost
+    uv run tools/metrics_merge.py report --store team.npz --by model --metric tokens --format csv
+
+The developer is the directory containing `.claude/` (or the top-level
+folder of the source, or the tarball name); override it with --developer.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from cost_tracker import estimate_cost  # noqa: E402  (shares PRICING with the hook)
+
+DEFAULT_STORE = Path('team_metrics.npz')
+DAILY_FILE = re.compile(r'(?:^|/)metrics/daily/(\d{4}-\d{2}-\d{2})\.json$')
+EPOCH = date(1970, 1, 1).toordinal()
+TOKEN_TYPES = ('input', 'output', 'cache_read', 'cache_write')
+
+# Column layout of each table: name -> dtype. Strings (session, model,
+# command, developer) are stored as codes into the store's vocabularies.
+TABLES = {
+    'records': {'key': np.uint64, 'session': np.int32, 'day': np.int32, 'developer': np.int32,
+                'duration': np.float64},
+    'usage': {'key': np.uint64, 'session': np.int32, 'day': np.int32, 'developer': np.int32,
+              'model': np.int32, 'input': np.int64, 'output': np.int64, 'cache_read': np.int64,
+              'cache_write': np.int64, 'cost': np.float64},
+    'commands': {'key': np.uint64, 'session': np.int32, 'day': np.int32, 'developer': np.int32,
+                 'command': np.int32},
+}
+VOCABULARIES = ('developers', 'sessions', 'models', 'commands')
+CODED_COLUMNS = {'session': 'sessions', 'model': 'models', 'command': 'commands'}
+
+
+def record_key(session_id: str, timestamp: str) -> int:
+    """Stable 64-bit identity of one Stop record."""
+    digest = hashlib.blake2b(f"{session_id}\0{timestamp}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def developer_from_path(relative: PurePosixPath, default: str) -> str:
+    """Name the developer after the folder that holds `.claude/`, else the top folder."""
+    parts = relative.parts
+    if '.claude' in parts:
+        index = parts.index('.claude')
+        return parts[index - 1] if index > 0 else default
+    if len(parts) > 3:  # <developer>/metrics/daily/<day>.json
+        return parts[0]
+    return default
+
+
+def empty_batch(developer: str, day_code: int) -> dict:
+    batch = {'developer': developer, 'day': day_code}
+    for name, cols in TABLES.items():
+        batch[name] = {col: [] for col in cols if col not in ('day', 'developer', 'cost')}
+        if name != 'records':
+            batch[name]['record'] = []  # index of the owning record within the batch
+    return batch
+
+
+def parse_daily(text: str, day: str, developer: str) -> dict:
+    """Flatten one daily file into per-table column lists."""
+    batch = empty_batch(developer, date.fromisoformat(day).toordinal() - EPOCH)
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        return batch
+
+    records, usage, commands = batch['records'], batch['usage'], batch['commands']
+    for session in data.get('sessions', []):
+        session_id = str(session.get('session_id', 'unknown'))
+        key = record_key(session_id, str(session.get('timestamp', '')))
+        index = len(records['key'])
+
+        records['key'].append(key)
+        records['session'].append(session_id)
+        records['duration'].append(float(session.get('duration_seconds') or 0))
+
+        for model, tokens in (session.get('usage') or {}).items():
+            usage['key'].append(key)
+            usage['record'].append(index)
+            usage['session'].append(session_id)
+            usage['model'].append(model)
+            for token_type in TOKEN_TYPES:
+                usage[token_type].append(int(tokens.get(token_type, 0)))
+
+        for cmd in session.get('commands', []):
+            commands['key'].append(key)
+            commands['record'].append(index)
+            commands['session'].append(session_id)
+            commands['command'].append(str(cmd))
+    return batch
+
+
+def _parse_file(args: tuple) -> dict:
+    path, day, developer = args
+    return parse_daily(Path(path).read_text(), day, developer)
+
+
+def iter_directory(root: Path, developer: Optional[str], jobs: int):
+    """Parse all daily files under a directory, in parallel."""
+    tasks = []
+    for path in root.rglob('*.json'):
+        relative = PurePosixPath(path.relative_to(root).as_posix())
+        match = DAILY_FILE.search(relative.as_posix())
+        if match:
+            tasks.append((str(path), match.group(1), developer or developer_from_path(relative, root.name)))
+
+    if jobs > 1 and len(tasks) > 64:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(_parse_file, tasks, chunksize=64)
+    else:
+        yield from map(_parse_file, tasks)
+
+
+def iter_tarball(path: Path, developer: Optional[str]):
+    """Parse all daily files in a tarball, streaming."""
+    default = path.name.split('.')[0]
+    with tarfile.open(path, 'r:*') as tar:
+        for member in tar:
+            match = DAILY_FILE.search(member.name)
+            if not (member.isfile() and match):
+                continue
+            relative = PurePosixPath(member.name.lstrip('/'))  # drops `.` parts, keeps `.claude`
+            extracted = tar.extractfile(member)
+            if extracted:
+                yield parse_daily(extracted.read().decode('utf-8'), match.group(1),
+                                  developer or developer_from_path(relative, default))
+
+
+class MetricsStore:
+    """Column arrays for records, per-model usage and command uses, plus vocabularies."""
+
+    def __init__(self):
+        self.tables = {name: {col: np.empty(0, dtype) for col, dtype in cols.items()}
+                       for name, cols in TABLES.items()}
+        self.vocab = {name: [] for name in VOCABULARIES}
+        self._codes = {name: {} for name in VOCABULARIES}
+
+    @classmethod
+    def load(cls, path: Path) -> 'MetricsStore':
+        store = cls()
+        if path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                for name, cols in TABLES.items():
+                    for col in cols:
+                        store.tables[name][col] = data[f'{name}.{col}']
+                for name in VOCABULARIES:
+                    store.vocab[name] = data[f'vocab.{name}'].tolist()
+                    store._codes[name] = {value: i for i, value in enumerate(store.vocab[name])}
+        return store
+
+    def save(self, path: Path):
+        arrays = {f'{name}.{col}': values for name, cols in self.tables.items() for col, values in cols.items()}
+        for name in VOCABULARIES:
+            arrays[f'vocab.{name}'] = np.array(self.vocab[name], dtype=str)
+        tmp = path.with_name(path.name + '.tmp.npz')
+        np.savez(tmp, **arrays)
+        tmp.replace(path)
+
+    def codes(self, vocabulary: str, values: list) -> np.ndarray:
+        """Map strings to vocabulary codes, extending the vocabulary as needed."""
+        codes = self._codes[vocabulary]
+        vocab = self.vocab[vocabulary]
+        out = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(vocab)
+                vocab.append(value)
+            out[i] = code
+        return out
+
+    def token_rates(self) -> np.ndarray:
+        """USD per token for each model code and token type, from cost_tracker's PRICING."""
+        return np.array([[estimate_cost(model, {t: 1_000_000}) / 1_000_000 for t in TOKEN_TYPES]
+                         for model in self.vocab['models']], dtype=np.float64).reshape(-1, len(TOKEN_TYPES))
+
+    def append(self, batches) -> tuple[int, int]:
+        """
+        Add parsed batches, dropping records already in the store.
+
+        Returns:
+            (records added, duplicate records skipped)
+        """
+        pending = {name: {col: [] for col in cols} for name, cols in TABLES.items()}
+        owner = {'usage': [], 'commands': []}
+        for batch in batches:
+            developer = self.codes('developers', [batch['developer']])[0]
+            offset = len(pending['records']['key'])
+            for name in TABLES:
+                part, dest = batch[name], pending[name]
+                n = len(part['key'])
+                if not n:
+                    continue
+                for col, values in part.items():
+                    if col == 'record':
+                        owner[name].extend(i + offset for i in values)
+                    else:
+                        dest[col].extend(values)
+                dest['day'].extend([batch['day']] * n)
+                dest['developer'].extend([developer] * n)
+
+        columns = {}
+        for name, cols in TABLES.items():
+            columns[name] = {}
+            for col, dtype in cols.items():
+                values = pending[name][col]
+                if col in CODED_COLUMNS:
+                    columns[name][col] = self.codes(CODED_COLUMNS[col], values)
+                elif col != 'cost':
+                    columns[name][col] = np.asarray(values, dtype=dtype)
+
+        usage = columns['usage']
+        tokens = np.column_stack([usage[t] for t in TOKEN_TYPES]).astype(np.float64) if len(usage['key']) \
+            else np.empty((0, len(TOKEN_TYPES)))
+        usage['cost'] = (tokens * self.token_rates()[usage['model']]).sum(axis=1)
+
+        # Dedupe: first occurrence of each record key, and nothing already stored
+        new_keys = columns['records']['key']
+        _, first = np.unique(new_keys, return_index=True)
+        keep = np.zeros(len(new_keys), dtype=bool)
+        keep[first] = True
+        keep &= ~np.isin(new_keys, self.tables['records']['key'])
+
+        for name in TABLES:
+            if name == 'records':
+                mask = keep
+            else:
+                mask = keep[np.asarray(owner[name], dtype=np.int64)]
+            for col, values in columns[name].items():
+                self.tables[name][col] = np.concatenate([self.tables[name][col], values[mask]])
+
+        return int(keep.sum()), int(len(new_keys) - keep.sum())
+
+
+def _group(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Unique group values and each row's group index."""
+    return np.unique(values, return_inverse=True)
+
+
+def _count_distinct(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Number of distinct `values` per group, vectorized."""
+    if len(groups) == 0:
+        return np.zeros(n_groups, dtype=np.int64)
+    order = np.lexsort((values, groups))
+    g, v = groups[order], values[order]
+    first = np.ones(len(g), dtype=bool)
+    first[1:] = (g[1:] != g[:-1]) | (v[1:] != v[:-1])
+    return np.bincount(g[first], minlength=n_groups)
+
+
+# Which table answers which metric
+METRIC_TABLE = {
+    'sessions': 'records',
+    'records': 'records',
+    'cost': 'usage',
+    'tokens': 'usage',
+    'uses': 'commands',
+}
+GROUP_COLUMN = {'day': 'day', 'developer': 'developer', 'model': 'model', 'command': 'command'}
+
+
+def aggregate(store: MetricsStore, by: str, metric: str) -> list[tuple[str, float]]:
+    """Aggregate `metric` per `by` group, sorted by value descending."""
+    table_name = METRIC_TABLE[metric]
+    if by == 'model':
+        table_name = 'usage'
+    elif by == 'command':
+        table_name = 'commands'
+    table = store.tables[table_name]
+
+    if metric == 'cost' and table_name != 'usage':
+        raise SystemExit(f"metric 'cost' cannot be grouped by {by}")
+    if metric == 'tokens' and table_name != 'usage':
+        raise SystemExit(f"metric 'tokens' cannot be grouped by {by}")
+    if metric == 'uses' and table_name != 'commands':
+        raise SystemExit("metric 'uses' requires --by command, day or developer")
+
+    keys, inverse = _group(table[GROUP_COLUMN[by]])
+    n = len(keys)
+    if metric == 'sessions':
+        values = _count_distinct(inverse, table['session'], n)
+    elif metric in ('records', 'uses'):
+        values = np.bincount(inverse, minlength=n)
+    elif metric == 'cost':
+        values = np.bincount(inverse, weights=table['cost'], minlength=n)
+    else:
+        total = sum(table[t].astype(np.float64) for t in TOKEN_TYPES)
+        values = np.bincount(inverse, weights=total, minlength=n)
+
+    if by == 'day':
+        labels = [(date.fromordinal(EPOCH) + timedelta(days=int(k))).isoformat() for k in keys]
+    else:
+        vocab = {'developer': 'developers', 'model': 'models', 'command': 'commands'}[by]
+        labels = [store.vocab[vocab][int(k)] for k in keys]
+
+    order = np.argsort(keys) if by == 'day' else np.argsort(-values, kind='stable')
+    return [(labels[i], float(values[i])) for i in order]
+
+
+def format_report(rows: list[tuple[str, float]], by: str, metric: str, fmt: str) -> str:
+    if fmt == 'json':
+        return json.dumps([{by: label, metric: value} for label, value in rows], indent=2)
+    if fmt == 'csv':
+        return "\n".join([f"{by},{metric}"] + [f"{label},{value:g}" for label, value in rows])
+
+    lines = [f"{by:<32} {metric:>14}", '-' * 47]
+    for label, value in rows:
+        shown = f"${value:,.2f}" if metric == 'cost' else f"{value:,.0f}"
+        lines.append(f"{label:<32} {shown:>14}")
+    return "\n".join(lines)
+
+
+def cmd_ingest(args):
+    store = MetricsStore.load(args.store)
+    start = time.perf_counter()
+    added = skipped = 0
+    for source in args.sources:
+        if source.is_dir():
+            batches = iter_directory(source, args.developer, args.jobs)
+        elif tarfile.is_tarfile(source):
+            batches = iter_tarball(source, args.developer)
+        else:
+            print(f"Skipping {source}: not a directory or tarball", file=sys.stderr)
+            continue
+        a, s = store.append(batches)
+        added += a
+        skipped += s
+    store.save(args.store)
+    print(f"Ingested {added} records ({skipped} duplicates skipped) in {time.perf_counter() - start:.2f}s "
+          f"-> {args.store} ({len(store.tables['records']['key'])} records, "
+          f"{len(store.vocab['developers'])} developers)")
+
+
+def cmd_report(args):
+    store = MetricsStore.load(args.store)
+    start = time.perf_counter()
+    rows = aggregate(store, args.by, args.metric)
+    if args.top:
+        rows = rows[:args.top]
+    print(format_report(rows, args.by, args.metric, args.format))
+    print(f"({time.perf_counter() - start:.3f}s)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge and aggregate team metrics.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help='Add metrics trees or tarballs to the store')
+    ingest.add_argument('sources', nargs='+', type=Path)
+    ingest.add_argument('--store', type=Path, default=DEFAULT_STORE)
+    ingest.add_argument('--developer', help='Attribute all sources to this developer')
+    ingest.add_argument('--jobs', type=int, default=4, help='Parallel parsers for directory sources')
+    ingest.set_defaults(func=cmd_ingest)
+
+    report = sub.add_parser('report', help='Aggregate the store')
+    report.add_argument('--store', type=Path, default=DEFAULT_STORE)
+    report.add_argument('--by', choices=list(GROUP_COLUMN), default='day')
+    report.add_argument('--metric', choices=list(METRIC_TABLE), default='sessions')
+    report.add_argument('--top', type=int, help='Only show the first N rows')
+    report.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+    report.set_defaults(func=cmd_report)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.9"
+# ///
+
+"""
+Merge hook profiles into one ranked report.
+
+Profiles are written per invocation when hooks run with CLAUDE_HOOKS_PROFILE
+set (see utils/profiling.py). This merges all of them - hundreds of runs
+across sessions - into, per hook, the functions that cost the most time
+and the lines that allocate the most memory.
+
+    uv run tools/profile_report.py                        # every hook, every session
+    uv run tools/profile_report.py --hook pre_tool_use    # one hook
+    uv run tools/profile_report.py --sort tottime --top 30
+    uv run tools/profile_report.py --hook context_detector --dump merged.prof  # for snakeviz etc.
+
+Reads the same log directory as the hooks (CLAUDE_HOOKS_LOG_DIR, default `logs`).
+"""
+
+import argparse
+import json
+import pstats
+import sys
+import sysconfig
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.constants import LOG_BASE_DIR  # noqa: E402
+
+PROFILE_GLOB = '*/profiles/*.prof'
+
+# Prefixes stripped from file names in the report
+_PATH_PREFIXES = sorted({
+    sysconfig.get_paths()['purelib'],
+    sysconfig.get_paths()['platlib'],
+    sysconfig.get_paths()['stdlib'],
+}, key=len, reverse=True)
+
+
+def short_path(filename: str) -> str:
+    """Trim stdlib/site-packages/project prefixes so locations stay readable."""
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):].lstrip('/\\')
+    if 'site-packages' in filename:
+        return filename.split('site-packages', 1)[1].lstrip('/\\')
+    try:
+        return str(Path(filename).resolve().relative_to(Path.cwd()))
+    except ValueError:
+        return filename
+
+
+def describe(func: tuple) -> str:
+    filename, line, name = func
+    if filename == '~':
+        return name  # builtin, e.g. <method 'write' of '_io.TextIOWrapper' objects>
+    return f"{short_path(filename)}:{line}({name})"
+
+
+def hook_of(path: Path) -> str:
+    """Profiles are named <hook>-<timestamp>-<pid>."""
+    return path.name.split('-', 1)[0]
+
+
+def collect(root: Path, hook: Optional[str]) -> Dict[str, List[Path]]:
+    by_hook = defaultdict(list)
+    for path in sorted(root.glob(PROFILE_GLOB)):
+        name = hook_of(path)
+        if hook is None or name == hook:
+            by_hook[name].append(path)
+    return by_hook
+
+
+def merge_stats(paths: List[Path]) -> Optional[pstats.Stats]:
+    stats = None
+    for path in paths:
+        try:
+            if stats is None:
+                stats = pstats.Stats(str(path))
+            else:
+                stats.add(str(path))
+        except Exception:
+            continue  # truncated or foreign profile
+    return stats
+
+
+def merge_allocations(paths: List[Path]) -> dict:
+    """Sum allocation sites across the .alloc.json files next to the profiles."""
+    sites = defaultdict(lambda: [0, 0, 0])  # (file, line) -> [bytes, blocks, invocations]
+    walls, peaks = [], []
+    for path in paths:
+        try:
+            data = json.loads(path.with_suffix('.alloc.json').read_text())
+        except (OSError, ValueError):
+            continue
+        walls.append(data.get('wall_seconds', 0.0))
+        peaks.append(data.get('peak_bytes', 0))
+        for site in data.get('sites', []):
+            entry = sites[(site['file'], site['line'])]
+            entry[0] += site['size']
+            entry[1] += site['count']
+            entry[2] += 1
+    return {'sites': sites, 'walls': walls, 'peaks': peaks}
+
+
+def report_hook(hook: str, paths: List[Path], sort: str, top: int, dump: Optional[Path]):
+    stats = merge_stats(paths)
+    allocs = merge_allocations(paths)
+    runs = len(paths)
+
+    print(f"\n=== {hook} ({runs} invocations) ===")
+    if allocs['walls']:
+        walls = sorted(allocs['walls'])
+        mean_ms = sum(walls) / len(walls) * 1000
+        p95_ms = walls[min(len(walls) - 1, int(len(walls) * 0.95))] * 1000
+        peak_kb = max(allocs['peaks']) / 1024
+        print(f"Wall time: mean {mean_ms:.1f} ms, p95 {p95_ms:.1f} ms (profiled)  Peak traced memory: {peak_kb:,.0f} KB")
+
+    if stats is None:
+        print("No readable profiles.")
+        return
+
+    total = stats.total_tt or 1e-12
+    column = 2 if sort == 'tottime' else 3  # stats entries: (cc, nc, tt, ct, callers)
+    ranked = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+
+    print(f"\nTop functions by {sort} (share of total profiled time, ms per invocation):")
+    print(f"{'share':>6} {'ms/run':>8} {'self ms':>8} {'calls/run':>10}  function")
+    for func, (_, ncalls, tottime, cumtime, _) in ranked[:top]:
+        value = tottime if sort == 'tottime' else cumtime
+        print(f"{value / total:>6.1%} {value / runs * 1000:>8.2f} {tottime / runs * 1000:>8.2f} "
+              f"{ncalls / runs:>10.1f}  {describe(func)}")
+
+    if allocs['sites']:
+        ranked_sites = sorted(allocs['sites'].items(), key=lambda item: item[1][0], reverse=True)
+        print("\nTop allocation sites (live at the end of main(), KB per invocation):")
+        print(f"{'KB/run':>8} {'blocks/run':>10} {'seen in':>8}  site")
+        for (filename, line), (size, count, seen) in ranked_sites[:top]:
+            print(f"{size / runs / 1024:>8.1f} {count / runs:>10.1f} {seen / runs:>8.0%}  {short_path(filename)}:{line}")
+
+    if dump:
+        stats.dump_stats(str(dump))
+        print(f"\nMerged profile written to {dump}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge hook profiles into a ranked report.')
+    parser.add_argument('--log-dir', type=Path, default=Path(LOG_BASE_DIR), help='Hook log directory')
+    parser.add_argument('--hook', help='Only this hook (e.g. pre_tool_use)')
+    parser.add_argument('--sort', choices=['cumulative', 'tottime'], default='cumulative',
+                        help='Rank by time including callees (default) or self time')
+    parser.add_argument('--top', type=int, default=20, help='Rows per table (default 20)')
+    parser.add_argument('--dump', type=Path, help='Also write the merged pstats file (per hook)')
+    args = parser.parse_args()
+
+    by_hook = collect(args.log_dir, args.hook)
+    if not by_hook:
+        print(f"No profiles under {args.log_dir}/ - run hooks with CLAUDE_HOOKS_PROFILE=1 first")
+        return
+
+    for hook, paths in sorted(by_hook.items()):
+        dump = args.dump
+        if dump and len(by_hook) > 1:
+            dump = dump.with_name(f"{dump.stem}-{hook}{dump.suffix}")
+        report_hook(hook, paths, args.sort, args.top, dump)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.9"
+# dependencies = [
+#     "pyyaml",
+# ]
+# ///
+
+"""
+Benchmark the UserPromptSubmit hooks on very large prompts.
+
+Generates prompts of the given sizes - a request followed by a pasted
+stack trace / log dump - and times context_loader and context_detector
+end to end (process start to exit, median of --runs) in a temp workspace
+with two competing contexts. Compare checkouts by pointing --hooks-dir at
+another worktree.
+
+Usage:
+    uv run tools/prompt_bench.py [--sizes 10K,100K,1M,10M] [--runs 5]
+                                 [--hooks-dir starter-hooks] [--json bench.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_HOOKS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = '10K,100K,1M,10M'
+HOOKS = ['context_loader', 'context_detector']
+
+CONTEXTS = {
+    'frontend': """\
+name: frontend
+indicators:
+  paths: ["src/components", "src/features", "src/hooks"]
+  extensions: [".tsx", ".ts", ".css"]
+  keywords: ["component", "react", "form", "hook", "styling", "render"]
+project_root: "frontend/"
+""",
+    'backend': """\
+name: backend
+indicators:
+  paths: ["src/Api", "src/Domain", "src/Infrastructure"]
+  extensions: [".cs", ".csproj"]
+  keywords: ["controller", "endpoint", "migration", "entity", "service", "repository"]
+project_root: "backend/"
+""",
+}
+
+REQUEST = "fix the crash when submitting the login form in src/components/LoginForm.tsx - log below:\n"
+LOG_LINES = [
+    "2026-10-18T09:14:{s:02d}.{ms:03d}Z ERROR [worker-{w}] request {r} failed: TypeError: Cannot read properties of undefined\n",
+    "    at handleSubmit (webpack-internal:///./src/components/LoginForm.tsx:{l}:17)\n",
+    "    at HTMLUnknownElement.callCallback (node_modules/react-dom/cjs/react-dom.development.js:4164:14)\n",
+    "    at invokeGuardedCallbackDev (node_modules/react-dom/cjs/react-dom.development.js:4213:16)\n",
+    "2026-10-18T09:14:{s:02d}.{ms:03d}Z INFO  [worker-{w}] retrying request {r} (attempt {a}/5)\n",
+]
+TAIL = "\nUncaught TypeError: Cannot read properties of undefined (reading 'email') at LoginForm.tsx:{l}\n"
+
+
+def parse_size(text: str) -> int:
+    units = {'K': 1024, 'M': 1024 ** 2}
+    text = text.strip().upper().rstrip('B')
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def make_prompt(size: int) -> str:
+    """A request, a log dump up to `size` characters, and the final error."""
+    parts = [REQUEST]
+    length = len(REQUEST)
+    i = 0
+    while length < size:
+        line = LOG_LINES[i % len(LOG_LINES)].format(
+            s=i % 60, ms=i % 1000, w=i % 8, r=1000 + i // 5, l=40 + i % 30, a=1 + i % 5)
+        parts.append(line)
+        length += len(line)
+        i += 1
+    parts.append(TAIL.format(l=42))
+    return ''.join(parts)[:size]
+
+
+def prepare_workspace(workdir: Path):
+    contexts = workdir / '.claude' / 'contexts'
+    contexts.mkdir(parents=True)
+    for name, text in CONTEXTS.items():
+        (contexts / f'{name}.yaml').write_text(text)
+
+    memory = workdir / '.claude' / 'memory'
+    memory.mkdir(parents=True)
+    for name in ('decisions.md', 'lessons.md', 'conventions.md'):
+        (memory / name).write_text(f"# {name}\n" + "".join(f"- entry {i}\n" for i in range(60)))
+
+
+def time_hook(cmd: list[str], payload: bytes, workdir: Path, env: dict, runs: int) -> float:
+    """Median wall time in ms, after one warm-up run (fills the content cache)."""
+    subprocess.run(cmd, input=payload, cwd=workdir, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, input=payload, cwd=workdir, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def time_analysis(hooks_dir: Path, prompt: str, runs: int):
+    """In-process time of the shared analysis pass, if this checkout has one."""
+    sys.path.insert(0, str(hooks_dir))
+    try:
+        from utils.prompt_analysis import analyze_prompt
+    except ImportError:
+        return None
+    finally:
+        sys.path.pop(0)
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        analyze_prompt(prompt)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark UserPromptSubmit hooks on large prompts.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Prompt sizes (default {DEFAULT_SIZES})')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per hook and size (default 5)')
+    parser.add_argument('--hooks-dir', type=Path, default=DEFAULT_HOOKS_DIR, help='Directory containing the hooks')
+    parser.add_argument('--json', type=Path, help='Also write results as JSON')
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp) / 'project'
+        prepare_workspace(workdir)
+        env = dict(os.environ,
+                   CLAUDE_HOOK_BUDGET_MS='0',  # time the work itself, not the deadline fallback
+                   CLAUDE_HOOKS_CACHE_DIR=str(Path(tmp) / 'cache'))
+
+        header = f"{'prompt':>8} {'analysis (ms)':>14}" + ''.join(f" {hook + ' (ms)':>22}" for hook in HOOKS)
+        print(header)
+        print('-' * len(header))
+        for size in sizes:
+            prompt = make_prompt(size)
+            payload = json.dumps({'session_id': 'bench', 'hook_event_name': 'UserPromptSubmit',
+                                  'prompt': prompt}).encode()
+            row = {'size': size, 'analysis_ms': time_analysis(args.hooks_dir, prompt, args.runs)}
+            for hook in HOOKS:
+                cmd = [sys.executable, str((args.hooks_dir / f'{hook}.py').resolve())]
+                row[hook] = time_hook(cmd, payload, workdir, env, args.runs)
+                shutil.rmtree(workdir / 'logs', ignore_errors=True)  # keep injection dedupe out of it
+            results.append(row)
+
+            analysis = '-' if row['analysis_ms'] is None else f"{row['analysis_ms']:.2f}"
+            label = f"{size // 1024 ** 2}MB" if size >= 1024 ** 2 else f"{size // 1024}KB"
+            print(f"{label:>8} {analysis:>14}" + ''.join(f" {row[hook]:>22.1f}" for hook in HOOKS))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
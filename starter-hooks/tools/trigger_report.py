@@ -0,0 +1,107 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.9"
+# ///
+
+"""
+Summarize context_loader's injection decisions.
+
+context_loader.py appends every gate decision to
+logs/context_loader_decisions.jsonl, including which triggers matched and
+which keywords the old substring gate would have fired on. This reports
+how often memory was injected, how many injections the substring gate
+would have made on prompts without a real trigger (its false positives,
+e.g. "add" in "address"), and the tokens that saved.
+
+    uv run tools/trigger_report.py
+    uv run tools/trigger_report.py --since 2026-10-01
+
+Reads the same log directory as the hooks (CLAUDE_HOOKS_LOG_DIR, default `logs`).
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.constants import LOG_BASE_DIR  # noqa: E402
+
+DECISIONS_LOG = Path(LOG_BASE_DIR) / 'context_loader_decisions.jsonl'
+
+
+def read_decisions(path: Path, since: str = '') -> list[dict]:
+    decisions = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn or partial line
+                if entry.get('timestamp', '') >= since:
+                    decisions.append(entry)
+    except OSError:
+        pass
+    return decisions
+
+
+def pct(part: int, whole: int) -> str:
+    return f"{part / whole:.1%}" if whole else "-"
+
+
+def format_report(decisions: list[dict]) -> str:
+    total = len(decisions)
+    injected = [d for d in decisions if d['inject']]
+    legacy = [d for d in decisions if d['legacy_matched']]
+    avoided = [d for d in legacy if not d['inject']]  # substring gate fired, no whole-word trigger
+    added = [d for d in injected if not d['legacy_matched']]
+    memo_hits = sum(1 for d in decisions if d.get('memo_hit'))
+
+    injected_tokens = sum(d.get('injected_tokens', 0) for d in decisions)
+    saved_tokens = sum(d.get('skipped_tokens', 0) for d in avoided)
+
+    lines = [
+        f"Prompts:                       {total} ({len({d.get('session_id') for d in decisions})} sessions)",
+        f"Memo hits:                     {memo_hits} ({pct(memo_hits, total)})",
+        f"Injected:                      {len(injected)} ({pct(len(injected), total)})",
+        f"Substring gate would inject:   {len(legacy)} ({pct(len(legacy), total)})",
+        f"  without whole-word trigger:  {len(avoided)} ({pct(len(avoided), len(legacy))} of its injections)",
+        f"Injected only by new triggers: {len(added)} (inflections/commands the old list missed)",
+        f"Tokens injected:               {injected_tokens:,}",
+        f"Tokens saved:                  {saved_tokens:,} (last full render per avoided injection)",
+    ]
+
+    culprits = Counter(kw for d in avoided for kw in d['legacy_matched'])
+    if culprits:
+        lines.append("")
+        lines.append("Substring matches that no longer trigger:")
+        for keyword, count in culprits.most_common(10):
+            lines.append(f"  {keyword:<12} {count}")
+
+    triggers = Counter(t for d in injected for t in d['matched'])
+    if triggers:
+        lines.append("")
+        lines.append("Triggers behind injections:")
+        for trigger, count in triggers.most_common(10):
+            lines.append(f"  {trigger:<12} {count}")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize context_loader's injection decisions.")
+    parser.add_argument('--log', type=Path, default=DECISIONS_LOG, help='Decisions log (JSONL)')
+    parser.add_argument('--since', default='', help='Only decisions from this ISO date/time on')
+    args = parser.parse_args()
+
+    decisions = read_decisions(args.log, args.since)
+    if not decisions:
+        print(f"No decisions in {args.log}")
+        return
+    print(format_report(decisions))
+
+
+if __name__ == '__main__':
+    main()
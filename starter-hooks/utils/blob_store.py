@@ -0,0 +1,95 @@
+"""
+Content-addressed blob store for large values in hook logs.
+
+Strings larger than the threshold (e.g. the `content` of a Write call) are
+moved to `logs/blobs/<hash[:2]>/<hash>.zz` (zlib-compressed) and replaced
+inline by a reference:
+
+    {"$blob": "<sha256>", "size": <bytes>}
+
+Identical content - the same file written twice, in any session - is
+stored once. Readers call `load_log()` or `rehydrate()` to get the
+original values back.
+
+Threshold in bytes: CLAUDE_HOOKS_BLOB_THRESHOLD (default 4096, 0 disables).
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any
+
+from utils.constants import LOG_BASE_DIR
+from utils.fileio import write_atomic
+
+BLOB_DIR = Path(LOG_BASE_DIR) / 'blobs'
+try:
+    BLOB_THRESHOLD = int(os.environ.get('CLAUDE_HOOKS_BLOB_THRESHOLD', '4096'))
+except ValueError:
+    BLOB_THRESHOLD = 4096
+BLOB_KEY = '$blob'
+
+
+def blob_path(digest: str) -> Path:
+    return BLOB_DIR / digest[:2] / f'{digest}.zz'
+
+
+def store_blob(data: bytes) -> str:
+    """Store bytes once under their sha256 and return the digest."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, zlib.compress(data, 6))
+    return digest
+
+
+def load_blob(digest: str) -> bytes:
+    return zlib.decompress(blob_path(digest).read_bytes())
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and BLOB_KEY in value and len(value) == 2
+
+
+def externalize(value: Any, threshold: int = BLOB_THRESHOLD) -> Any:
+    """Return a copy of `value` with every string over `threshold` bytes moved to the store."""
+    if threshold <= 0:
+        return value
+    if isinstance(value, str):
+        if len(value) * 4 < threshold:
+            return value  # can't exceed the threshold even as 4-byte UTF-8
+        data = value.encode('utf-8')
+        if len(data) > threshold:
+            return {BLOB_KEY: store_blob(data), 'size': len(data)}
+        return value
+    if isinstance(value, dict):
+        return {k: externalize(v, threshold) for k, v in value.items()}
+    if isinstance(value, list):
+        return [externalize(v, threshold) for v in value]
+    return value
+
+
+def rehydrate(value: Any) -> Any:
+    """Return a copy of `value` with blob references replaced by their content."""
+    if is_blob_ref(value):
+        try:
+            return load_blob(value[BLOB_KEY]).decode('utf-8')
+        except (OSError, zlib.error):
+            return value  # blob pruned or unreadable - keep the reference
+    if isinstance(value, dict):
+        return {k: rehydrate(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rehydrate(v) for v in value]
+    return value
+
+
+def load_log(path: Path, rehydrated: bool = True) -> list:
+    """Read a JSON list log, restoring externalized values by default."""
+    try:
+        entries = json.loads(Path(path).read_text())
+    except (OSError, json.JSONDecodeError, ValueError):
+        return []
+    return rehydrate(entries) if rehydrated else entries
@@ -14,6 +14,9 @@ from pathlib import Path
 # Default is 'logs' in the current working directory
 LOG_BASE_DIR = os.environ.get("CLAUDE_HOOKS_LOG_DIR", "logs")
 
+# Usage metrics, relative to the project root
+METRICS_DIR = Path(".claude/metrics")
+
 def get_session_log_dir(session_id: str) -> Path:
     """
     Get the log directory for a specific session.
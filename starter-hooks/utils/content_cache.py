@@ -0,0 +1,162 @@
+"""
+Per-user, content-addressed cache shared by every checkout and worktree.
+
+Hooks resolve `.claude/...` relative to the current directory, so each
+worktree would otherwise re-parse identical configs and re-render
+identical memory. Entries are keyed by a hash of their inputs' bytes, so
+any checkout with the same inputs reuses the same entry.
+
+- Location: CLAUDE_HOOKS_CACHE_DIR, else $XDG_CACHE_HOME/claude-hooks
+  (~/.cache/claude-hooks)
+- Size: least-recently-used entries are evicted once the total exceeds
+  CLAUDE_HOOKS_CACHE_MAX_MB (default 64)
+- Concurrency: writes go to a temp file and are renamed into place, so
+  readers see a whole entry or none; eviction runs under a lock
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from utils.fileio import write_atomic
+from utils.locking import file_lock
+
+
+def _default_cache_dir() -> Path:
+    if os.environ.get('CLAUDE_HOOKS_CACHE_DIR'):
+        return Path(os.environ['CLAUDE_HOOKS_CACHE_DIR'])
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        return Path(os.environ['LOCALAPPDATA']) / 'claude-hooks' / 'cache'
+    base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return Path(base) / 'claude-hooks'
+
+
+def _max_bytes(default_mb: float = 64) -> int:
+    try:
+        return int(float(os.environ.get('CLAUDE_HOOKS_CACHE_MAX_MB', default_mb)) * 1024 * 1024)
+    except (ValueError, OverflowError):
+        return int(default_mb * 1024 * 1024)
+
+
+CACHE_DIR = _default_cache_dir()
+MAX_BYTES = _max_bytes()
+
+# Evict down to this fraction of MAX_BYTES, so eviction doesn't run on every write
+EVICT_TARGET = 0.8
+
+# At most one eviction scan per interval across all processes
+EVICT_INTERVAL_SECONDS = 60
+
+
+class ContentCache:
+    """A namespace of pickled values keyed by the hash of their inputs."""
+
+    def __init__(self, namespace: str, version: int = 1, root: Optional[Path] = None):
+        """
+        Args:
+            namespace: Kind of entry, e.g. 'contexts' or 'memory'
+            version: Bump when the cached value's shape or rendering changes
+            root: Cache root (defaults to CACHE_DIR)
+        """
+        self.namespace = namespace
+        self.version = version
+        self.root = root or CACHE_DIR
+
+    def key(self, *parts) -> str:
+        """Hash inputs (str or bytes) into a cache key."""
+        digest = hashlib.sha256(f"{self.namespace}:{self.version}".encode())
+        for part in parts:
+            data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+            digest.update(len(data).to_bytes(8, 'little'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / self.namespace / key[:2] / f'{key}.pkl'
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable entry (e.g. written by an incompatible Python) - drop it
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a value atomically, evicting old entries if over budget."""
+        path = self._path(key)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True, mode=0o700)
+            path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            write_atomic(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            return  # caching is best-effort
+        self._maybe_evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def _maybe_evict(self):
+        marker = self.root / '.last_eviction'
+        try:
+            if time.time() - marker.stat().st_mtime < EVICT_INTERVAL_SECONDS:
+                return
+        except OSError:
+            pass
+        with file_lock(marker):
+            try:
+                if time.time() - marker.stat().st_mtime < EVICT_INTERVAL_SECONDS:
+                    return  # another process just evicted
+            except OSError:
+                pass
+            marker.touch()
+            evict(self.root, MAX_BYTES)
+
+
+def evict(root: Path, max_bytes: int):
+    """Delete least-recently-used entries across all namespaces until under budget."""
+    entries = []
+    total = 0
+    for path in root.glob('*/*/*.pkl'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # removed concurrently
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return
+
+    target = max_bytes * EVICT_TARGET
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            continue
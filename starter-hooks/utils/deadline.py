@@ -0,0 +1,184 @@
+"""
+Time budgets for hooks that run inline in the turn.
+
+The hook's work runs in a forked worker while the hook process waits for
+its result. If the budget runs out, the hook returns the last good cached
+output instead and exits; the worker, already detached from the hook's
+stdout, finishes on its own in the background (refreshing the cache for
+next time), so no work is lost or done twice. Every deadline hit is
+appended to `logs/deadline_hits.jsonl`.
+
+Budgets (milliseconds, 0 disables the guard):
+    CLAUDE_HOOK_BUDGET_MS                    default for all hooks (1500)
+    CLAUDE_HOOK_BUDGET_MS_<HOOK>             per hook, e.g. ..._CONTEXT_DETECTOR
+
+On platforms without fork(), and while profiling (CLAUDE_HOOKS_PROFILE),
+the work simply runs inline.
+"""
+
+import json
+import os
+import select
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from utils.constants import LOG_BASE_DIR
+from utils.fileio import append_jsonl, write_atomic
+from utils.locking import file_lock
+from utils.profiling import profiling_enabled
+
+DEFAULT_BUDGET_MS = 1500
+CACHE_DIR = Path(LOG_BASE_DIR) / 'deadline_cache'
+HITS_LOG = Path(LOG_BASE_DIR) / 'deadline_hits.jsonl'
+
+# Cached outputs kept per hook
+MAX_CACHED_KEYS = 100
+
+
+class DeadlineExceeded(Exception):
+    """The hook ran out of budget; `fallback` is the last good output (or None)."""
+
+    def __init__(self, hook: str, budget_ms: int, fallback: Optional[str]):
+        super().__init__(f"{hook} exceeded its {budget_ms}ms budget")
+        self.fallback = fallback
+
+
+def get_budget_ms(hook: str) -> int:
+    """Resolve the hook's budget from the environment."""
+    specific = os.environ.get(f"CLAUDE_HOOK_BUDGET_MS_{hook.upper()}")
+    value = specific if specific is not None else os.environ.get('CLAUDE_HOOK_BUDGET_MS')
+    try:
+        return int(value) if value is not None else DEFAULT_BUDGET_MS
+    except ValueError:
+        return DEFAULT_BUDGET_MS
+
+
+class DeadlineGuard:
+    """Run a hook's work under a time budget with a cached fallback."""
+
+    def __init__(self, hook: str, cache_key: str, budget_ms: Optional[int] = None):
+        """
+        Args:
+            hook: Hook name, used for the budget, cache file and hit log
+            cache_key: What the cached fallback is keyed by (e.g. the session id)
+            budget_ms: Override the configured budget
+        """
+        self.hook = hook
+        self.cache_key = cache_key
+        self.budget_ms = get_budget_ms(hook) if budget_ms is None else budget_ms
+        self.cache_file = CACHE_DIR / f'{hook}.json'
+
+    def run(self, compute: Callable[[], Any], cache: Optional[Callable[[Any], Optional[str]]] = None) -> Any:
+        """
+        Run `compute` within the budget and return its (JSON-serializable) result.
+
+        Args:
+            compute: The hook's work; must not print
+            cache: Maps a result to the text to remember as fallback
+                   (defaults to the result itself, when it is a string)
+
+        Raises:
+            DeadlineExceeded: Budget ran out; carries the cached fallback
+        """
+        cache = cache or (lambda result: result if isinstance(result, str) else None)
+
+        # Profiling runs the work inline so the profile sees it
+        if self.budget_ms <= 0 or not hasattr(os, 'fork') or profiling_enabled(self.hook):
+            result = compute()
+            self.remember(cache(result))
+            return result
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            self._worker(compute, cache, read_fd, write_fd)  # never returns
+
+        os.close(write_fd)
+        payload, finished = self._wait_for(read_fd)
+        os.close(read_fd)
+
+        if not finished:
+            fallback = self.fallback()
+            self._record_hit(has_fallback=fallback is not None)
+            raise DeadlineExceeded(self.hook, self.budget_ms, fallback)
+
+        os.waitpid(pid, os.WNOHANG)
+        if not payload:
+            raise RuntimeError(f"{self.hook} worker failed")
+        return json.loads(payload)['result']
+
+    def _worker(self, compute, cache, read_fd: int, write_fd: int):
+        """Forked child: detach, compute, hand back the result, refresh the cache."""
+        status = 0
+        try:
+            os.close(read_fd)
+            os.setsid()
+            # Release the hook's stdio so the hook can finish without us
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+
+            result = compute()
+            data = json.dumps({'result': result}).encode('utf-8')
+            try:
+                while data:
+                    data = data[os.write(write_fd, data):]
+            except BrokenPipeError:
+                pass  # the hook already gave up and used the fallback
+            os.close(write_fd)
+            self.remember(cache(result))
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _wait_for(self, read_fd: int) -> Tuple[bytes, bool]:
+        """Read the worker's payload until EOF or the deadline."""
+        deadline = time.monotonic() + self.budget_ms / 1000
+        chunks = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return b'', False
+            ready, _, _ = select.select([read_fd], [], [], remaining)
+            if not ready:
+                return b'', False
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                return b''.join(chunks), True
+            chunks.append(chunk)
+
+    def fallback(self) -> Optional[str]:
+        """Last good output cached for this key."""
+        try:
+            return json.loads(self.cache_file.read_text()).get(self.cache_key)
+        except (OSError, json.JSONDecodeError, ValueError):
+            return None
+
+    def remember(self, output: Optional[str]):
+        """Cache a good output as the fallback for this key."""
+        if output is None:
+            return
+        with file_lock(self.cache_file):
+            try:
+                cached = json.loads(self.cache_file.read_text())
+            except (OSError, json.JSONDecodeError, ValueError):
+                cached = {}
+            cached.pop(self.cache_key, None)
+            cached[self.cache_key] = output
+            while len(cached) > MAX_CACHED_KEYS:
+                cached.pop(next(iter(cached)))
+            write_atomic(self.cache_file, json.dumps(cached))
+
+    def _record_hit(self, has_fallback: bool):
+        """Append the deadline hit for later analysis."""
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'hook': self.hook,
+            'cache_key': self.cache_key,
+            'budget_ms': self.budget_ms,
+            'fallback': has_fallback,
+        }
+        append_jsonl(HITS_LOG, entry)
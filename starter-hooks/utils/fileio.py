@@ -0,0 +1,52 @@
+"""
+File writes shared by the hooks.
+
+Parallel sessions append to the same logs and replace the same state
+files, so every hook writes them the same two ways:
+- `append_line()` / `append_jsonl()` - one O_APPEND write per record, so
+  concurrent appends never interleave partial lines
+- `write_atomic()` - write a temp file next to the target and rename it,
+  so readers never see a partial file
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+
+def append_line(path: Union[str, Path], line: str):
+    """Append `line` and a newline in a single O_APPEND write. Best-effort: errors are ignored."""
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (line + '\n').encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # logging must never break a hook
+
+
+def append_jsonl(path: Union[str, Path], record: dict):
+    """Append `record` as one JSON line (see append_line)."""
+    append_line(path, json.dumps(record))
+
+
+def write_atomic(path: Path, data: Union[str, bytes]):
+    """
+    Replace `path` with `data` via a per-process temp file and a rename.
+
+    Raises OSError like a plain write; the temp file is removed on failure.
+    """
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data.encode('utf-8') if isinstance(data, str) else data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,55 @@
+"""
+Cross-process file locking for state shared between parallel sessions.
+
+Set CLAUDE_HOOKS_LOCK_STATS to a file path to append every lock wait
+(`<lock file>\t<seconds>`) there - used by tools/loadtest.py.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.fileio import append_line
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_STATS = os.environ.get('CLAUDE_HOOKS_LOCK_STATS')
+
+
+def _record_wait(lock_path: Path, seconds: float):
+    """Append one lock wait sample."""
+    append_line(LOCK_STATS, f"{lock_path.name}\t{seconds:.6f}")
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    Hold an exclusive lock on `<path>.lock` for the duration of the block.
+
+    Args:
+        path: The shared file being protected (the lock lives next to it)
+    """
+    lock_path = Path(path).with_name(Path(path).name + '.lock')
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(lock_path, 'a+') as lock_file:
+        start = time.perf_counter()
+        if os.name == 'nt':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        if LOCK_STATS:
+            _record_wait(lock_path, time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
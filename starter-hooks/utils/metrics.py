@@ -0,0 +1,224 @@
+"""
+Prometheus/OpenMetrics textfile exporter for hook and usage metrics.
+
+Hooks time themselves with `hook_timer()`, which appends one line per
+invocation to a small spool file. On each Stop event the exporter folds
+the spool and the session's new usage into running counters and
+histograms, then re-renders the textfile with an atomic rename. The work
+per Stop depends only on what happened since the previous Stop, never on
+how much history exists.
+
+Point node_exporter's textfile collector (or any scraper) at the output:
+    CLAUDE_METRICS_TEXTFILE=/var/lib/node_exporter/textfile/claude.prom
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from utils.constants import METRICS_DIR
+from utils.fileio import append_line, write_atomic
+from utils.locking import file_lock
+from utils.profiling import profile_hook, profiling_enabled
+
+LATENCY_SPOOL = METRICS_DIR / 'hook_latency.spool'
+EXPORTER_STATE = METRICS_DIR / 'exporter_state.json'
+TEXTFILE = Path(os.environ.get('CLAUDE_METRICS_TEXTFILE', str(METRICS_DIR / 'claude.prom')))
+
+# Upper bounds (seconds) of the hook latency histogram buckets
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# Forget per-session bookkeeping after this long without a Stop event
+SESSION_TTL_SECONDS = 7 * 24 * 3600
+
+
+def record_hook_latency(hook: str, seconds: float):
+    """Append one latency sample to the spool."""
+    append_line(LATENCY_SPOOL, f"{hook}\t{seconds:.6f}")
+
+
+@contextmanager
+def hook_timer(hook: str):
+    """
+    Time a hook's main() - including exits via sys.exit() - and spool it.
+
+    With CLAUDE_HOOKS_PROFILE set, main() is also profiled (see
+    utils/profiling.py).
+
+    Usage:
+        if __name__ == '__main__':
+            with hook_timer('context_loader'):
+                main()
+    """
+    start = time.perf_counter()
+    try:
+        if profiling_enabled(hook):
+            with profile_hook(hook):
+                yield
+        else:
+            yield
+    finally:
+        record_hook_latency(hook, time.perf_counter() - start)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsExporter:
+    """Incrementally maintained counters and histograms, rendered to a textfile."""
+
+    def __init__(self, state_file: Path = EXPORTER_STATE, textfile: Path = TEXTFILE):
+        self.state_file = state_file
+        self.textfile = textfile
+
+    def update(self, session_id: str, commands: List[str], usage: Dict[str, Dict[str, int]],
+               cost_by_model: Dict[str, float]):
+        """
+        Fold one Stop event into the counters and rewrite the textfile.
+
+        Args:
+            session_id: Session that stopped
+            commands: Commands used in this turn
+            usage: New tokens since the previous Stop, {model: {type: count}}
+            cost_by_model: Estimated cost of those tokens, {model: usd}
+        """
+        with file_lock(self.state_file):
+            state = self._load_state()
+            now = time.time()
+
+            state['stop_events'] += 1
+            sessions = state['sessions']
+            if session_id not in sessions:
+                state['sessions_total'] += 1
+            sessions[session_id] = now
+
+            for cmd in commands:
+                state['commands'][cmd] = state['commands'].get(cmd, 0) + 1
+
+            for model, counts in usage.items():
+                model_tokens = state['tokens'].setdefault(model, {})
+                for token_type, count in counts.items():
+                    model_tokens[token_type] = model_tokens.get(token_type, 0) + count
+
+            for model, cost in cost_by_model.items():
+                state['cost_usd'][model] = state['cost_usd'].get(model, 0.0) + cost
+
+            for hook, seconds in self._drain_spool():
+                self._observe(state['hook_latency'], hook, seconds)
+
+            # Bounded bookkeeping: only sessions seen recently are kept
+            for sid, seen in list(sessions.items()):
+                if now - seen > SESSION_TTL_SECONDS:
+                    del sessions[sid]
+
+            state['last_update'] = now
+            self._save_state(state)
+            self._write_textfile(self.render(state))
+
+    def _load_state(self) -> dict:
+        state = {}
+        if self.state_file.exists():
+            try:
+                state = json.loads(self.state_file.read_text())
+            except (json.JSONDecodeError, ValueError):
+                state = {}
+        state.setdefault('stop_events', 0)
+        state.setdefault('sessions_total', 0)
+        state.setdefault('sessions', {})
+        state.setdefault('commands', {})
+        state.setdefault('tokens', {})
+        state.setdefault('cost_usd', {})
+        state.setdefault('hook_latency', {})
+        return state
+
+    def _save_state(self, state: dict):
+        write_atomic(self.state_file, json.dumps(state))
+
+    def _drain_spool(self) -> List[Tuple[str, float]]:
+        """Atomically take over the spool, so concurrent appends go to a fresh file."""
+        if not LATENCY_SPOOL.exists():
+            return []
+        claimed = LATENCY_SPOOL.with_name(LATENCY_SPOOL.name + f'.{os.getpid()}')
+        try:
+            os.replace(LATENCY_SPOOL, claimed)
+        except OSError:
+            return []
+
+        samples = []
+        try:
+            for line in claimed.read_text().splitlines():
+                hook, _, seconds = line.partition('\t')
+                try:
+                    samples.append((hook, float(seconds)))
+                except ValueError:
+                    continue  # torn or garbled line
+        finally:
+            claimed.unlink()
+        return samples
+
+    @staticmethod
+    def _observe(histograms: dict, hook: str, seconds: float):
+        hist = histograms.setdefault(hook, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                hist['buckets'][i] += 1
+                break
+        hist['sum'] += seconds
+        hist['count'] += 1
+
+    def render(self, state: dict) -> str:
+        """Render the state in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name: str, metric_type: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        family('claude_stop_events_total', 'counter', 'Stop events recorded.')
+        lines.append(f"claude_stop_events_total {state['stop_events']}")
+
+        family('claude_sessions_total', 'counter', 'Distinct sessions seen.')
+        lines.append(f"claude_sessions_total {state['sessions_total']}")
+
+        family('claude_commands_total', 'counter', 'Commands used, by command.')
+        for cmd, count in sorted(state['commands'].items()):
+            lines.append(f'claude_commands_total{{command="{_escape(cmd)}"}} {count}')
+
+        family('claude_tokens_total', 'counter', 'Tokens used, by model and type.')
+        for model, counts in sorted(state['tokens'].items()):
+            for token_type, count in sorted(counts.items()):
+                lines.append(f'claude_tokens_total{{model="{_escape(model)}",type="{_escape(token_type)}"}} {count}')
+
+        family('claude_cost_usd_total', 'counter', 'Estimated cost in USD, by model.')
+        for model, cost in sorted(state['cost_usd'].items()):
+            lines.append(f'claude_cost_usd_total{{model="{_escape(model)}"}} {_format_value(round(cost, 6))}')
+
+        family('claude_hook_duration_seconds', 'histogram', 'Hook wall time, by hook.')
+        for hook, hist in sorted(state['hook_latency'].items()):
+            label = f'hook="{_escape(hook)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, hist['buckets']):
+                cumulative += count
+                lines.append(f'claude_hook_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'claude_hook_duration_seconds_bucket{{{label},le="+Inf"}} {hist["count"]}')
+            lines.append(f'claude_hook_duration_seconds_sum{{{label}}} {_format_value(round(hist["sum"], 6))}')
+            lines.append(f'claude_hook_duration_seconds_count{{{label}}} {hist["count"]}')
+
+        family('claude_metrics_last_update_timestamp_seconds', 'gauge', 'Unix time of the last export.')
+        lines.append(f"claude_metrics_last_update_timestamp_seconds {_format_value(round(state.get('last_update', 0), 3))}")
+
+        return "\n".join(lines) + "\n"
+
+    def _write_textfile(self, text: str):
+        """Write next to the target and rename, so scrapers never see a partial file."""
+        self.textfile.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.textfile, text)
@@ -0,0 +1,117 @@
+"""
+Opt-in deep profiling for hooks.
+
+Timing says a hook is slow; a profile says why. When enabled, every hook
+run through `hook_timer()` is wrapped in cProfile and tracemalloc, and
+each invocation leaves two files in its session's log directory:
+
+    logs/<session_id>/profiles/<hook>-<timestamp>-<pid>.prof        # pstats
+    logs/<session_id>/profiles/<hook>-<timestamp>-<pid>.alloc.json  # allocation sites
+
+Merge them into a ranked report with `tools/profile_report.py`.
+
+Enable with CLAUDE_HOOKS_PROFILE:
+- `1` / `all`                      - profile every hook
+- `pre_tool_use,context_detector`  - profile only these hooks
+
+Profiling adds real overhead (tracemalloc especially) and runs
+DeadlineGuard work inline, so leave it off outside investigations.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from utils.constants import get_session_log_dir
+
+PROFILE_ENV = 'CLAUDE_HOOKS_PROFILE'
+
+# Allocation sites kept per invocation
+ALLOC_TOP_SITES = 50
+
+
+def profiling_enabled(hook: Optional[str] = None) -> bool:
+    """Whether profiling is on (for `hook`, or for any hook when None)."""
+    value = os.environ.get(PROFILE_ENV, '').strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return False
+    if value in ('1', 'true', 'yes', 'on', 'all') or hook is None:
+        return True
+    return hook.lower() in {name.strip() for name in value.split(',')}
+
+
+def _peek_session_id() -> str:
+    """Read the hook's stdin for its session_id, then put the input back."""
+    try:
+        data = sys.stdin.read()
+    except (OSError, ValueError):
+        return 'unknown'
+    sys.stdin = io.StringIO(data)
+    try:
+        return json.loads(data).get('session_id') or 'unknown'
+    except (ValueError, AttributeError):
+        return 'unknown'
+
+
+def _allocation_sites(snapshot, limit: int) -> list:
+    """Top allocation sites by size, excluding the profiler's own frames."""
+    sites = []
+    for stat in snapshot.statistics('lineno'):
+        frame = stat.traceback[0]
+        if frame.filename == __file__ or frame.filename.endswith('tracemalloc.py'):
+            continue
+        sites.append({
+            'file': frame.filename,
+            'line': frame.lineno,
+            'size': stat.size,
+            'count': stat.count,
+        })
+        if len(sites) >= limit:
+            break
+    return sites
+
+
+@contextmanager
+def profile_hook(hook: str):
+    """
+    Profile the enclosed block (a hook's main()) and write its profiles.
+
+    Exits via sys.exit() are profiled too; failures writing the profile
+    never affect the hook.
+    """
+    import cProfile
+    import tracemalloc
+
+    session_id = _peek_session_id()
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        try:
+            out_dir = get_session_log_dir(session_id) / 'profiles'
+            out_dir.mkdir(parents=True, exist_ok=True)
+            stem = f"{hook}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}"
+            profiler.dump_stats(str(out_dir / f'{stem}.prof'))
+            (out_dir / f'{stem}.alloc.json').write_text(json.dumps({
+                'hook': hook,
+                'session_id': session_id,
+                'wall_seconds': round(wall, 6),
+                'peak_bytes': peak,
+                'sites': _allocation_sites(snapshot, ALLOC_TOP_SITES),
+            }))
+        except Exception:
+            pass  # profiling must never break a hook
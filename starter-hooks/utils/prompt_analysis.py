@@ -0,0 +1,94 @@
+"""
+Shared, bounded analysis of the user's prompt for UserPromptSubmit hooks.
+
+Developers paste whole stack traces and log dumps into prompts. Scanning
+every megabyte of those once per keyword (and once per context) makes
+the hooks scale with the paste rather than with what the user asked.
+
+`analyze_prompt()` does one pass over a bounded view of the prompt:
+- prompts up to CLAUDE_PROMPT_ANALYZE_KB (default 64) are used whole
+- larger ones keep the head (where the request usually is) and the tail
+  (where the latest error usually is), plus file-path-like tokens taken
+  from evenly spaced windows across the middle
+
+The view is lowercased once and shared by every check in the hook.
+"""
+
+import os
+import re
+from typing import List
+
+try:
+    MAX_ANALYZED_CHARS = int(float(os.environ.get('CLAUDE_PROMPT_ANALYZE_KB', '64')) * 1024)
+except (ValueError, OverflowError):
+    MAX_ANALYZED_CHARS = 64 * 1024
+
+# Split of the budget for oversized prompts
+HEAD_SHARE = 0.5
+TAIL_SHARE = 0.25
+MIDDLE_WINDOWS = 32  # the rest is sampled as this many windows
+
+# A whitespace-separated token ending in a file extension, e.g. `settings.json`
+EXTENSION_RE = re.compile(r'\.[A-Za-z][A-Za-z0-9]{0,5}$')
+TOKEN_PUNCTUATION = '()[]{}<>"\'`,;!?.'
+LINE_SUFFIX_RE = re.compile(r'(?::\d+)+:?$')
+
+
+class PromptView:
+    """A bounded, lowercased view of a prompt, computed once per hook."""
+
+    def __init__(self, prompt: str):
+        self.length = len(prompt)
+        self.sampled = self.length > MAX_ANALYZED_CHARS
+        self.text = sample_prompt(prompt) if self.sampled else prompt
+        self.lower = self.text.lower()
+
+    def __contains__(self, needle: str) -> bool:
+        """Substring test against the lowercased view (`needle` must be lowercase)."""
+        return needle in self.lower
+
+
+def sample_prompt(prompt: str, limit: int = MAX_ANALYZED_CHARS) -> str:
+    """
+    Reduce an oversized prompt to at most ~`limit` characters.
+
+    Keeps the head and tail verbatim; from the middle keeps only the
+    path-like tokens found in evenly spaced windows, since repeated log
+    lines carry little signal beyond the files they mention.
+    """
+    head_len = int(limit * HEAD_SHARE)
+    tail_len = int(limit * TAIL_SHARE)
+    middle_start, middle_end = head_len, len(prompt) - tail_len
+
+    window = max(1, (limit - head_len - tail_len) // MIDDLE_WINDOWS)
+    stride = max(window, (middle_end - middle_start) // MIDDLE_WINDOWS)
+
+    paths = {}
+    for start in range(middle_start, middle_end - window + 1, stride):
+        chunk = prompt[start:start + window]
+        chunk = chunk[chunk.find(' ') + 1:chunk.rfind(' ')]  # drop tokens cut by the window edges
+        for token in path_tokens(chunk):
+            paths[token] = None  # ordered, de-duplicated
+
+    return '\n'.join((prompt[:head_len], ' '.join(paths), prompt[middle_end:]))
+
+
+def path_tokens(text: str) -> List[str]:
+    """
+    Tokens that look like file paths: `src/app/Login.tsx:42:7` -> `src/app/Login.tsx`,
+    `C:\\x\\y.cs`, `settings.json`. Line/column suffixes are dropped so
+    repeated stack frames collapse into one token.
+    """
+    tokens = []
+    for token in text.split():
+        token = token.strip(TOKEN_PUNCTUATION)
+        if ':' in token:
+            token = LINE_SUFFIX_RE.sub('', token)
+        if '/' in token or '\\' in token or ('.' in token and EXTENSION_RE.search(token)):
+            tokens.append(token)
+    return tokens
+
+
+def analyze_prompt(prompt: str) -> PromptView:
+    """The single analysis pass both UserPromptSubmit hooks start from."""
+    return PromptView(prompt)
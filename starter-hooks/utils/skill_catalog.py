@@ -0,0 +1,256 @@
+"""
+Indexed catalog of installed skills (.claude/skills/**/SKILL.md).
+
+Each SKILL.md starts with frontmatter:
+
+    ---
+    name: browser-testing
+    description: Visual UI testing using Claude Chrome extension. ...
+    ---
+
+Reading hundreds of those on every prompt would dominate the hook, so
+the name, description and path of each skill are kept in a SQLite index
+(`logs/skill_catalog.sqlite`) with an inverted term table. Lookups are
+indexed queries, so their cost doesn't grow with the number of skills;
+prompt words that appear in too many skills to discriminate are skipped,
+which also caps the rows a match can touch.
+
+Refresh is incremental: at most once per CLAUDE_SKILLS_REFRESH_SECONDS
+(default 30) the SKILL.md files are stat'ed, and only those whose mtime
+or size changed are re-read. Frontmatter is parsed without pyyaml.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from utils.constants import LOG_BASE_DIR
+
+SKILLS_DIR = Path('.claude/skills')
+CATALOG_DB = Path(LOG_BASE_DIR) / 'skill_catalog.sqlite'
+try:
+    REFRESH_SECONDS = float(os.environ.get('CLAUDE_SKILLS_REFRESH_SECONDS', '30'))
+except ValueError:
+    REFRESH_SECONDS = 30.0
+
+# Term weights: a prompt word matching a skill's name/path counts more than its description
+NAME_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+
+# Query at most this many distinct prompt words
+MAX_QUERY_TERMS = 64
+
+# Prompt words found in more skills than this are too common to rank by
+MAX_TERM_SKILLS = 200
+
+TOKEN_RE = re.compile(r'[a-z0-9]{3,}')
+STOPWORDS = frozenset("""
+    the and for with that this from into your you are was were will can not but all any use
+    using used when what which how why who its has have had our out via per etc also them then
+    than they there their these those such only each more most some other about after before
+    should would could need needs make makes like just please file files code skill skills
+""".split())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS skills_name ON skills (name);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    path TEXT NOT NULL,
+    weight INTEGER NOT NULL,
+    PRIMARY KEY (term, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS terms_path ON terms (path);
+CREATE TABLE IF NOT EXISTS vocab (term TEXT PRIMARY KEY, skills INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of 3+ characters, minus stopwords, in order of appearance."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def parse_frontmatter(text: str) -> dict:
+    """
+    Read `key: value` pairs from a leading `---` block.
+
+    Handles quoted values and folded (`>` / `|`) or indented continuation
+    lines - enough for SKILL.md without importing pyyaml.
+    """
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != '---':
+        return {}
+
+    fields = {}
+    key = None
+    for line in lines[1:]:
+        if line.strip() == '---':
+            break
+        if key and line[:1].isspace() and line.strip():
+            fields[key] = f"{fields[key]} {line.strip()}".strip()
+            continue
+        if ':' not in line:
+            continue
+        key, _, value = line.partition(':')
+        key = key.strip()
+        value = value.strip()
+        if value in ('>', '|', '>-', '|-'):
+            value = ''
+        fields[key] = value.strip('"\'')
+    return fields
+
+
+class SkillCatalog:
+    """Name/description/path index over SKILL.md files."""
+
+    def __init__(self, skills_dir: Path = SKILLS_DIR, db_path: Path = CATALOG_DB):
+        self.skills_dir = skills_dir
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=5, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Re-index SKILL.md files added, changed or removed since the last scan.
+
+        Returns the number of skills re-read (0 when the scan was throttled).
+        """
+        if not self.skills_dir.is_dir():
+            return 0
+        if not force and time.time() - self._last_scan() < REFRESH_SECONDS:
+            return 0
+
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')  # one refresher at a time across sessions
+        try:
+            if not force and time.time() - self._last_scan() < REFRESH_SECONDS:
+                conn.execute('COMMIT')
+                return 0  # another session just refreshed
+
+            known = {path: (mtime, size) for path, mtime, size in
+                     conn.execute('SELECT path, mtime_ns, size FROM skills')}
+            updated = 0
+            for dirpath, _, filenames in os.walk(self.skills_dir):
+                if 'SKILL.md' not in filenames:
+                    continue
+                skill_file = Path(dirpath) / 'SKILL.md'
+                try:
+                    stat = skill_file.stat()
+                except OSError:
+                    continue
+                path = skill_file.parent.relative_to(self.skills_dir).as_posix()
+                if known.pop(path, None) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                self._index(path, skill_file, stat)
+                updated += 1
+
+            for path in known:  # deleted since the last scan
+                self._drop_terms(path)
+                conn.execute('DELETE FROM skills WHERE path = ?', (path,))
+
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_scan', ?)", (time.time(),))
+            conn.execute('COMMIT')
+            return updated
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _last_scan(self) -> float:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_scan'").fetchone()
+        return row[0] if row else 0.0
+
+    def _index(self, path: str, skill_file: Path, stat: os.stat_result):
+        try:
+            # Frontmatter sits at the top - don't read long skill bodies
+            with open(skill_file, encoding='utf-8', errors='replace') as f:
+                fields = parse_frontmatter(f.read(8192))
+        except OSError:
+            return
+        name = fields.get('name') or skill_file.parent.name
+        description = fields.get('description', '')
+
+        weights = {}
+        for term in tokenize(description):
+            weights[term] = DESCRIPTION_WEIGHT
+        for term in tokenize(f"{name} {path.replace('/', ' ')}"):
+            weights[term] = NAME_WEIGHT
+
+        self.conn.execute('INSERT OR REPLACE INTO skills VALUES (?, ?, ?, ?, ?)',
+                          (path, name, description, stat.st_mtime_ns, stat.st_size))
+        self._drop_terms(path)
+        self.conn.executemany('INSERT INTO terms VALUES (?, ?, ?)',
+                              [(term, path, weight) for term, weight in weights.items()])
+        self.conn.executemany('INSERT INTO vocab VALUES (?, 1) ON CONFLICT (term) DO UPDATE SET skills = skills + 1',
+                              [(term,) for term in weights])
+
+    def _drop_terms(self, path: str):
+        self.conn.execute('UPDATE vocab SET skills = skills - 1 '
+                          'WHERE term IN (SELECT term FROM terms WHERE path = ?)', (path,))
+        self.conn.execute('DELETE FROM terms WHERE path = ?', (path,))
+
+    def lookup(self, refs: Iterable[str]) -> List[dict]:
+        """
+        Resolve a context's `skills:` entries, given as a path under
+        .claude/skills (`frontend/react-patterns`) or a frontmatter name.
+        Entries not in the catalog are returned with no path or description.
+        """
+        skills = []
+        for ref in refs:
+            ref = str(ref).strip().strip('/')
+            if ref.endswith('/SKILL.md'):
+                ref = ref[:-len('/SKILL.md')]
+            row = self.conn.execute(
+                'SELECT path, name, description FROM skills WHERE path = ? OR name = ? LIMIT 1',
+                (ref, ref)).fetchone()
+            if row:
+                skills.append({'path': row[0], 'name': row[1], 'description': row[2]})
+            else:
+                skills.append({'path': None, 'name': ref, 'description': ''})
+        return skills
+
+    def match(self, prompt: str, limit: int, min_score: int = NAME_WEIGHT + DESCRIPTION_WEIGHT,
+              exclude: Iterable[str] = ()) -> List[dict]:
+        """Top skills whose name/path/description words appear in the prompt."""
+        terms = list(dict.fromkeys(tokenize(prompt)))[:MAX_QUERY_TERMS]
+        if not terms or limit <= 0:
+            return []
+        placeholders = ','.join('?' * len(terms))
+        terms = [term for term, in self.conn.execute(
+            f'SELECT term FROM vocab WHERE term IN ({placeholders}) AND skills BETWEEN 1 AND ?',
+            (*terms, MAX_TERM_SKILLS))]
+        if not terms:
+            return []
+        excluded = set(exclude)
+        placeholders = ','.join('?' * len(terms))
+        rows = self.conn.execute(
+            f"""SELECT s.path, s.name, s.description, SUM(t.weight) AS score
+                FROM terms t JOIN skills s ON s.path = t.path
+                WHERE t.term IN ({placeholders})
+                GROUP BY t.path HAVING score >= ?
+                ORDER BY score DESC, s.name LIMIT ?""",
+            (*terms, min_score, limit + len(excluded))).fetchall()
+        return [{'path': path, 'name': name, 'description': description, 'score': score}
+                for path, name, description, score in rows if path not in excluded][:limit]